@@ -19,6 +19,7 @@ class Settings:
     SCENE_DETECT_CRON: str = os.getenv("SCENE_DETECT_CRON", "0 3 * * *")
     SCENE_DETECT_THRESHOLD: float = float(os.getenv("SCENE_DETECT_THRESHOLD", "27.0"))
     SCENE_DETECT_MIN_SCENE_LEN: float = float(os.getenv("SCENE_DETECT_MIN_SCENE_LEN", "0.5"))
+    SCENE_DETECT_CONCURRENCY: int = int(os.getenv("SCENE_DETECT_CONCURRENCY", str(max(1, (os.cpu_count() or 2) // 2))))  # Videos split in parallel
 
     # Transcode settings for Chromium-compatible video conversion
     # CRF 22 = good quality/size balance for Pi storage, preset slow = better compression
@@ -32,6 +33,7 @@ class Settings:
     YOUTUBE_SYNC_ENABLED: bool = os.getenv("YOUTUBE_SYNC_ENABLED", "true").lower() == "true"
     YOUTUBE_SYNC_CRON: str = os.getenv("YOUTUBE_SYNC_CRON", "0 */6 * * *")  # Every 6 hours
     YOUTUBE_COOKIES_FILE: str = os.getenv("YOUTUBE_COOKIES_FILE", "/app/data/youtube_cookies.txt")
+    YOUTUBE_SYNC_CONCURRENCY: int = int(os.getenv("YOUTUBE_SYNC_CONCURRENCY", "2"))  # Playlists synced in parallel
 
     # Scheduled batch transcode settings
     # Runs on a cron schedule and transcodes all media until the stop hour
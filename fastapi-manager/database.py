@@ -4,8 +4,10 @@ import logging
 import sqlite3
 from pathlib import Path
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
 from config import settings
 
@@ -18,15 +20,59 @@ class Base(DeclarativeBase):
 
 
 # Create engine
+# Sessions are opened per request and from threadpool workers, so keep an
+# explicit pool of reusable connections. StaticPool would share a single
+# SQLite connection across threads, so a sized QueuePool is used instead.
 engine = create_engine(
     f"sqlite:///{settings.DATABASE_PATH}",
     echo=False,
-    connect_args={"check_same_thread": False},
+    connect_args={"check_same_thread": False, "timeout": 30},
+    poolclass=QueuePool,
+    pool_size=10,
+    max_overflow=20,
+    pool_timeout=30,
+    pool_pre_ping=True,
 )
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine for code that runs on the event loop (the download queue).
+# aiosqlite runs each connection on its own thread, so queries awaited here
+# never block request handling.
+async_engine = create_async_engine(
+    f"sqlite+aiosqlite:///{settings.DATABASE_PATH}",
+    echo=False,
+    connect_args={"timeout": 30},
+    poolclass=AsyncAdaptedQueuePool,
+    pool_size=10,
+    max_overflow=20,
+    pool_timeout=30,
+    pool_pre_ping=True,
+)
+
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, autoflush=False, expire_on_commit=False
+)
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Configure each new SQLite connection for concurrent readers.
+
+    WAL lets the queue UI read while the download worker writes, and
+    synchronous=NORMAL drops the per-commit fsync (safe under WAL).
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=268435456")
+    cursor.close()
+
+
+event.listen(engine, "connect", _set_sqlite_pragmas)
+event.listen(async_engine.sync_engine, "connect", _set_sqlite_pragmas)
+
 
 def _run_migrations():
     """Run database migrations."""
@@ -93,6 +139,35 @@ def _run_migrations():
                     conn.commit()
                     logger.info("Successfully added fail_count column")
 
+                # create_all() only builds indexes for new tables, so add the
+                # composite item indexes to existing databases here
+                cursor.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_youtube_item_playlist_status "
+                    "ON youtube_playlist_items (playlist_id, download_status, position)"
+                )
+                cursor.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_youtube_item_playlist_position "
+                    "ON youtube_playlist_items (playlist_id, position)"
+                )
+                conn.commit()
+
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='downloads'")
+        if cursor.fetchone() is not None:
+            # Composite indexes for the download queue/history scans
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_download_status_created "
+                "ON downloads (status, created_at)"
+            )
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_download_status_completed "
+                "ON downloads (status, completed_at)"
+            )
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_download_status_started "
+                "ON downloads (status, started_at)"
+            )
+            conn.commit()
+
     except Exception as e:
         logger.error(f"Migration failed: {e}")
         conn.rollback()
@@ -101,6 +176,121 @@ def _run_migrations():
         conn.close()
 
 
+# Keep youtube_playlist_status_counts in step with youtube_playlist_items.
+# Each trigger adjusts the affected playlist's row by +/-1 per status.
+_PLAYLIST_COUNT_TRIGGERS = {
+    "trg_youtube_item_counts_insert": """
+        CREATE TRIGGER trg_youtube_item_counts_insert
+        AFTER INSERT ON youtube_playlist_items
+        BEGIN
+            INSERT INTO youtube_playlist_status_counts (playlist_id, total, pending, completed, failed)
+            VALUES (
+                NEW.playlist_id, 1,
+                NEW.download_status = 'pending',
+                NEW.download_status = 'completed',
+                NEW.download_status = 'failed'
+            )
+            ON CONFLICT (playlist_id) DO UPDATE SET
+                total = total + 1,
+                pending = pending + excluded.pending,
+                completed = completed + excluded.completed,
+                failed = failed + excluded.failed;
+        END
+    """,
+    "trg_youtube_item_counts_update": """
+        CREATE TRIGGER trg_youtube_item_counts_update
+        AFTER UPDATE OF download_status, playlist_id ON youtube_playlist_items
+        WHEN OLD.download_status IS NOT NEW.download_status
+            OR OLD.playlist_id IS NOT NEW.playlist_id
+        BEGIN
+            UPDATE youtube_playlist_status_counts SET
+                total = total - 1,
+                pending = pending - (OLD.download_status = 'pending'),
+                completed = completed - (OLD.download_status = 'completed'),
+                failed = failed - (OLD.download_status = 'failed')
+            WHERE playlist_id = OLD.playlist_id;
+            INSERT INTO youtube_playlist_status_counts (playlist_id, total, pending, completed, failed)
+            VALUES (
+                NEW.playlist_id, 1,
+                NEW.download_status = 'pending',
+                NEW.download_status = 'completed',
+                NEW.download_status = 'failed'
+            )
+            ON CONFLICT (playlist_id) DO UPDATE SET
+                total = total + 1,
+                pending = pending + excluded.pending,
+                completed = completed + excluded.completed,
+                failed = failed + excluded.failed;
+        END
+    """,
+    "trg_youtube_item_counts_delete": """
+        CREATE TRIGGER trg_youtube_item_counts_delete
+        AFTER DELETE ON youtube_playlist_items
+        BEGIN
+            UPDATE youtube_playlist_status_counts SET
+                total = total - 1,
+                pending = pending - (OLD.download_status = 'pending'),
+                completed = completed - (OLD.download_status = 'completed'),
+                failed = failed - (OLD.download_status = 'failed')
+            WHERE playlist_id = OLD.playlist_id;
+        END
+    """,
+    "trg_youtube_playlist_counts_delete": """
+        CREATE TRIGGER trg_youtube_playlist_counts_delete
+        AFTER DELETE ON youtube_playlists
+        BEGIN
+            DELETE FROM youtube_playlist_status_counts WHERE playlist_id = OLD.id;
+        END
+    """,
+}
+
+
+def _install_playlist_count_triggers():
+    """Create the playlist count triggers, backfilling counts on first install."""
+    conn = sqlite3.connect(settings.DATABASE_PATH)
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='trigger'")
+        existing = {row[0] for row in cursor.fetchall()}
+        missing = [name for name in _PLAYLIST_COUNT_TRIGGERS if name not in existing]
+
+        if not missing:
+            return
+
+        logger.info("Installing YouTube playlist count triggers and backfilling counts")
+
+        # Drop and rebuild everything in one transaction so counts and
+        # triggers always start out consistent. sqlite3 only opens a
+        # transaction implicitly before DML, so begin it before the drops.
+        cursor.execute("BEGIN")
+        for name in _PLAYLIST_COUNT_TRIGGERS:
+            cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+        cursor.execute("DELETE FROM youtube_playlist_status_counts")
+        cursor.execute("""
+            INSERT INTO youtube_playlist_status_counts (playlist_id, total, pending, completed, failed)
+            SELECT
+                playlist_id,
+                COUNT(*),
+                SUM(download_status = 'pending'),
+                SUM(download_status = 'completed'),
+                SUM(download_status = 'failed')
+            FROM youtube_playlist_items
+            GROUP BY playlist_id
+        """)
+        for sql in _PLAYLIST_COUNT_TRIGGERS.values():
+            cursor.execute(sql)
+
+        conn.commit()
+
+    except Exception as e:
+        logger.error(f"Failed to install playlist count triggers: {e}")
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
 def init_db():
     """Initialize the database by running migrations and creating all tables."""
     # Run migrations first
@@ -109,6 +299,8 @@ def init_db():
     # Create any missing tables
     Base.metadata.create_all(bind=engine)
 
+    _install_playlist_count_triggers()
+
 
 def get_db():
     """Get a database session."""
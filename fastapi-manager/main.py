@@ -11,6 +11,7 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 
 from config import settings
+from database import async_engine
 from routers import download, sync, organize, web, process, transcode, youtube_simple
 from services import rclone, pyscenedetect
 from services import transcode as transcode_service
@@ -88,8 +89,11 @@ async def scheduled_youtube_sync():
     """Run scheduled YouTube playlist sync job."""
     logger.info("Starting scheduled YouTube sync job")
     try:
-        await youtube_sync_simple.sync_all_playlists()
-        logger.info("Scheduled YouTube sync completed")
+        # Run through the sync worker so it never overlaps a single-playlist sync
+        if youtube_sync_simple.enqueue_all_playlists():
+            logger.info("Scheduled YouTube sync queued")
+        else:
+            logger.info("Scheduled YouTube sync skipped, a full sync is already queued")
     except Exception as e:
         logger.exception(f"Scheduled YouTube sync error: {e}")
 
@@ -118,6 +122,10 @@ async def lifespan(app: FastAPI):
     logger.info("Starting download worker...")
     worker_task = asyncio.create_task(download_queue.start_worker())
 
+    # Start the YouTube playlist sync worker
+    logger.info("Starting YouTube sync worker...")
+    youtube_worker_task = asyncio.create_task(youtube_sync_simple.start_worker())
+
     # Start sync scheduler if configured
     if settings.SYNC_ENABLED and settings.RCLONE_REMOTE and settings.RCLONE_BUCKET:
         try:
@@ -213,6 +221,17 @@ async def lifespan(app: FastAPI):
     except asyncio.CancelledError:
         pass
 
+    # Stop the YouTube sync worker
+    logger.info("Stopping YouTube sync worker...")
+    youtube_sync_simple.stop_worker()
+    youtube_worker_task.cancel()
+    try:
+        await youtube_worker_task
+    except asyncio.CancelledError:
+        pass
+
+    await async_engine.dispose()
+
 
 app = FastAPI(title="Media Manager", lifespan=lifespan)
 
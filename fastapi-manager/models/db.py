@@ -1,9 +1,9 @@
 """SQLAlchemy database models."""
 
-import json
 from datetime import datetime
 from typing import Optional
 
+import orjson
 from sqlalchemy import String, Float, Text, DateTime, Index, ForeignKey, Boolean, Integer
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -19,6 +19,13 @@ from models.download import (
 )
 
 
+def _dumps(value) -> str:
+    return orjson.dumps(value).decode()
+
+
+_loads = orjson.loads
+
+
 class Download(Base):
     """SQLAlchemy model for download jobs."""
 
@@ -41,11 +48,15 @@ class Download(Base):
     __table_args__ = (
         Index("idx_created_at", "created_at"),
         Index("idx_completed_at", "completed_at"),
+        # Queue scans filter on status and sort on one of the timestamps
+        Index("idx_download_status_created", "status", "created_at"),
+        Index("idx_download_status_completed", "status", "completed_at"),
+        Index("idx_download_status_started", "status", "started_at"),
     )
 
     def get_metadata(self) -> MovieMetadata | TVMetadata | MusicMetadata | CommercialMetadata:
         """Deserialize metadata from JSON."""
-        parsed = json.loads(self.metadata_json)
+        parsed = _loads(self.metadata_json)
         media_type = MediaType(self.media_type)
         if media_type == MediaType.MOVIE:
             return MovieMetadata(**parsed)
@@ -58,7 +69,7 @@ class Download(Base):
 
     def set_metadata(self, metadata: MovieMetadata | TVMetadata | MusicMetadata | CommercialMetadata):
         """Serialize metadata to JSON."""
-        self.metadata_json = json.dumps(metadata.model_dump())
+        self.metadata_json = _dumps(metadata.model_dump())
 
     def to_pydantic(self) -> DownloadJob:
         """Convert to Pydantic model."""
@@ -167,6 +178,26 @@ class YouTubePlaylistItem(Base):
         Index("idx_youtube_item_playlist", "playlist_id"),
         Index("idx_youtube_item_video_id", "youtube_video_id", "playlist_id", unique=True),
         Index("idx_youtube_item_status", "download_status"),
+        # Cover the per-status counts and the position-ordered item pages
+        Index("idx_youtube_item_playlist_status", "playlist_id", "download_status", "position"),
+        Index("idx_youtube_item_playlist_position", "playlist_id", "position"),
     )
 
 
+class YouTubePlaylistStatusCounts(Base):
+    """SQLAlchemy model for per-playlist item counts by download status.
+
+    Maintained by SQLite triggers on youtube_playlist_items (see
+    database._install_playlist_count_triggers) so reads are a primary-key
+    lookup instead of an aggregate over the items table.
+    """
+
+    __tablename__ = "youtube_playlist_status_counts"
+
+    playlist_id: Mapped[str] = mapped_column(
+        String(36), ForeignKey("youtube_playlists.id"), primary_key=True
+    )
+    total: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    pending: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    completed: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    failed: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
@@ -3,7 +3,7 @@
 from datetime import datetime
 from enum import Enum
 from typing import Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class DownloadType(str, Enum):
@@ -32,6 +32,8 @@ class YouTubeUserCreate(BaseModel):
 
 class YouTubeUserResponse(BaseModel):
     """Response containing YouTube user information."""
+    model_config = ConfigDict(from_attributes=True)
+
     id: str
     email: str
     display_name: str
@@ -58,6 +60,8 @@ class YouTubePlaylistUpdate(BaseModel):
 
 class YouTubePlaylistResponse(BaseModel):
     """Response containing YouTube playlist information."""
+    model_config = ConfigDict(from_attributes=True)
+
     id: str
     user_id: str
     user_email: str
@@ -79,6 +83,8 @@ class YouTubePlaylistResponse(BaseModel):
 
 class YouTubePlaylistItemResponse(BaseModel):
     """Response containing YouTube playlist item information."""
+    model_config = ConfigDict(from_attributes=True)
+
     id: str
     playlist_id: str
     youtube_video_id: str
@@ -110,9 +116,12 @@ class YouTubePlaylistsGroupedResponse(BaseModel):
 
 
 class YouTubeAllPlaylistsResponse(BaseModel):
-    """Response containing all playlists grouped by user."""
-    users: list[YouTubePlaylistsGroupedResponse] = []
-    total_playlists: int = 0
+    """Response containing one page of playlists grouped by user."""
+    users: list[YouTubePlaylistsGroupedResponse] = Field(
+        default=[], description="Page of users (at most 500 per request)"
+    )
+    total_playlists: int = Field(default=0, description="Playlists in this page")
+    total_users: int = Field(default=0, description="Users across all pages")
 
 
 class YouTubeSyncRequest(BaseModel):
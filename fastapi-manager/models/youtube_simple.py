@@ -84,6 +84,7 @@ class YouTubeSyncStatusResponse(BaseModel):
     is_running: bool
     current_playlist_id: Optional[str] = None
     current_playlist_title: Optional[str] = None
+    active_playlists: dict[str, str] = {}  # Playlist ID -> title for every sync in progress
     progress_message: Optional[str] = None
 
 
@@ -38,7 +38,7 @@ async def start_download(request: DownloadRequest):
     The download will be queued and processed in order.
     Downloads are processed one at a time to avoid overloading the system.
     """
-    job = download_queue.add_job(
+    job = await download_queue.add_job(
         url=request.url,
         media_type=request.media_type,
         metadata=request.metadata,
@@ -49,7 +49,7 @@ async def start_download(request: DownloadRequest):
 @router.get("/queue", response_model=DownloadQueueResponse)
 async def get_queue():
     """List pending and active downloads."""
-    return download_queue.get_queue()
+    return await download_queue.get_queue()
 
 
 @router.get("/history", response_model=DownloadHistoryResponse)
@@ -58,13 +58,13 @@ async def get_history(
     offset: int = Query(default=0, ge=0),
 ):
     """List completed downloads with pagination."""
-    return download_queue.get_history(limit=limit, offset=offset)
+    return await download_queue.get_history(limit=limit, offset=offset)
 
 
 @router.get("/{download_id}", response_model=DownloadJob)
 async def get_download(download_id: str):
     """Get a specific download by ID."""
-    job = download_queue.get_job(download_id)
+    job = await download_queue.get_job(download_id)
     if not job:
         raise HTTPException(status_code=404, detail="Download not found")
     return job
@@ -73,11 +73,11 @@ async def get_download(download_id: str):
 @router.delete("/{download_id}")
 async def cancel_download(download_id: str):
     """Cancel a pending or active download."""
-    job = download_queue.get_job(download_id)
+    job = await download_queue.get_job(download_id)
     if not job:
         raise HTTPException(status_code=404, detail="Download not found")
 
-    if download_queue.cancel_job(download_id):
+    if await download_queue.cancel_job(download_id):
         return {"status": "cancelled", "id": download_id}
     else:
         raise HTTPException(
@@ -1,16 +1,17 @@
 """API endpoints for torrent organization."""
 
+import json
 from pathlib import Path
 from typing import Literal
 
 from fastapi import APIRouter, HTTPException, Request
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, StreamingResponse
 from fastapi.templating import Jinja2Templates
 from pydantic import BaseModel
 
 from config import settings
 from services.metadata import analyze_item
-from services.organizer import scan_downloads, move_item, preview_destination
+from services.organizer import scan_downloads, iter_downloads, move_item, preview_destination
 
 router = APIRouter()
 
@@ -22,6 +23,7 @@ templates = Jinja2Templates(directory=BASE_DIR / "templates")
 class AnalyzeRequest(BaseModel):
     """Request body for analyze endpoint."""
     path: str
+    detail: bool = False
 
 
 class BatchAnalyzeRequest(BaseModel):
@@ -55,6 +57,18 @@ class PreviewRequest(BaseModel):
     metadata: dict
 
 
+def _stream_downloads():
+    """
+    Yield the Downloads folder listing as NDJSON.
+
+    The first line carries downloads_path, then one item per line as soon
+    as it has been scanned.
+    """
+    yield json.dumps({"downloads_path": f"{settings.MEDIA_BASE}/Downloads"}) + "\n"
+    for item in iter_downloads():
+        yield json.dumps(item) + "\n"
+
+
 @router.get("/", response_class=HTMLResponse)
 async def organize_page(request: Request):
     """Render the organize page."""
@@ -69,12 +83,18 @@ async def organize_page(request: Request):
 
 
 @router.get("/list")
-async def list_downloads():
+async def list_downloads(request: Request):
     """List items in the Downloads folder.
 
+    Send `Accept: application/x-ndjson` to stream the items one per line
+    instead of receiving a single JSON document.
+
     Returns:
         List of items with name, type, size, and path
     """
+    if "application/x-ndjson" in request.headers.get("accept", ""):
+        return StreamingResponse(_stream_downloads(), media_type="application/x-ndjson")
+
     items = await scan_downloads()
     return {
         "downloads_path": f"{settings.MEDIA_BASE}/Downloads",
@@ -104,7 +124,7 @@ async def analyze_file(request: AnalyzeRequest):
                 detail="Path must be within the downloads directory"
             )
 
-        result = await analyze_item(request.path)
+        result = await analyze_item(request.path, detail=request.detail)
         return result
 
     except FileNotFoundError as e:
@@ -8,7 +8,7 @@ from fastapi.responses import HTMLResponse, JSONResponse
 from fastapi.templating import Jinja2Templates
 
 from config import settings
-from services.organizer import is_companion_file
+from services.organizer import build_folder_index, is_companion_file
 
 router = APIRouter()
 
@@ -103,7 +103,11 @@ async def get_pending_count():
         return HTMLResponse("<p class='muted'>Downloads folder not found</p>")
 
     all_items = [item for item in downloads_path.iterdir() if not item.name.startswith(".")]
-    visible_items = [item for item in all_items if not is_companion_file(item, all_items)]
+    folder_index = build_folder_index(all_items)
+    visible_items = [
+        item for item in all_items
+        if item.is_dir() or not is_companion_file(item, folder_index)
+    ]
     count = len(visible_items)
 
     if count == 0:
@@ -147,10 +151,11 @@ async def list_files():
         return JSONResponse({"items": [], "error": "Downloads folder not found"})
 
     all_items = [item for item in downloads_path.iterdir() if not item.name.startswith(".")]
+    folder_index = build_folder_index(all_items)
 
     items = []
     for item in sorted(all_items, key=lambda x: (not x.is_dir(), x.name.lower())):
-        if is_companion_file(item, all_items):
+        if not item.is_dir() and is_companion_file(item, folder_index):
             continue
 
         file_type = _detect_file_type(item)
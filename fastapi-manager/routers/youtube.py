@@ -1,12 +1,14 @@
 """YouTube sync router with OAuth2 and playlist management endpoints."""
 
+import json
 import logging
 from datetime import datetime, timezone
 from uuid import uuid4
 
 from fastapi import APIRouter, HTTPException, Query, BackgroundTasks, Request
-from fastapi.responses import RedirectResponse
-from sqlalchemy import select, func
+from fastapi.responses import RedirectResponse, StreamingResponse
+from sqlalchemy import select, func, delete, literal
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import joinedload
 
 from database import SessionLocal
@@ -35,12 +37,52 @@ from services.youtube_sync import youtube_sync
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Status values used by the item count aggregates
+_ST_PENDING = YouTubeItemStatus.PENDING.value
+_ST_COMPLETED = YouTubeItemStatus.COMPLETED.value
+_ST_FAILED = YouTubeItemStatus.FAILED.value
+
+# Built once so SQLAlchemy reuses its compiled-statement cache entry;
+# callers add .where() (and .group_by() for the per-playlist variant)
+_ITEM_COUNT_COLUMNS = (
+    func.count(YouTubePlaylistItem.id).label("total"),
+    func.count().filter(YouTubePlaylistItem.download_status == _ST_PENDING).label("pending"),
+    func.count().filter(YouTubePlaylistItem.download_status == _ST_COMPLETED).label("completed"),
+    func.count().filter(YouTubePlaylistItem.download_status == _ST_FAILED).label("failed"),
+)
+_item_counts_select = select(*_ITEM_COUNT_COLUMNS)
+_item_counts_by_playlist_select = select(YouTubePlaylistItem.playlist_id, *_ITEM_COUNT_COLUMNS)
+
 
 def _get_session():
     """Get database session."""
     return SessionLocal()
 
 
+def _stream_playlist_items(
+    playlist_response: YouTubePlaylistResponse,
+    total_items: int,
+    items_stmt,
+):
+    """
+    Yield a playlist detail as NDJSON.
+
+    The first line carries the playlist and total_items, then one item per
+    line. Rows are pulled from the database in batches so only one batch is
+    held in memory at a time.
+    """
+    header = {
+        "playlist": playlist_response.model_dump(mode="json"),
+        "total_items": total_items,
+    }
+    yield json.dumps(header) + "\n"
+
+    with _get_session() as session:
+        result = session.scalars(items_stmt.execution_options(yield_per=100))
+        for item in result:
+            yield YouTubePlaylistItemResponse.model_validate(item).model_dump_json() + "\n"
+
+
 # OAuth Authentication
 
 
@@ -84,24 +126,12 @@ async def oauth_callback(request: Request, code: str, state: str):
         encrypted_refresh = youtube_api.encrypt_token(user_data["refresh_token"])
 
         # Create or update user in database
+        now = datetime.now(timezone.utc)
         with _get_session() as session:
-            # Check if user already exists
-            stmt = select(YouTubeUser).where(
-                YouTubeUser.email == user_data["email"]
-            )
-            user = session.scalar(stmt)
-
-            if user:
-                # Update existing user
-                user.display_name = user_data["display_name"]
-                user.channel_id = user_data["channel_id"]
-                user.access_token = encrypted_access
-                user.refresh_token = encrypted_refresh
-                user.token_expiry = user_data["token_expiry"]
-                user.updated_at = datetime.now(timezone.utc)
-            else:
-                # Create new user
-                user = YouTubeUser(
+            # Upsert on email in a single statement
+            stmt = (
+                sqlite_insert(YouTubeUser)
+                .values(
                     id=str(uuid4()),
                     email=user_data["email"],
                     display_name=user_data["display_name"],
@@ -109,13 +139,24 @@ async def oauth_callback(request: Request, code: str, state: str):
                     access_token=encrypted_access,
                     refresh_token=encrypted_refresh,
                     token_expiry=user_data["token_expiry"],
-                    created_at=datetime.now(timezone.utc),
-                    updated_at=datetime.now(timezone.utc),
+                    created_at=now,
+                    updated_at=now,
                 )
-                session.add(user)
-
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[YouTubeUser.email],
+                set_={
+                    "display_name": stmt.excluded.display_name,
+                    "channel_id": stmt.excluded.channel_id,
+                    "access_token": stmt.excluded.access_token,
+                    "refresh_token": stmt.excluded.refresh_token,
+                    "token_expiry": stmt.excluded.token_expiry,
+                    "updated_at": stmt.excluded.updated_at,
+                },
+            ).returning(YouTubeUser.id)
+
+            user_id = session.scalar(stmt)
             session.commit()
-            user_id = user.id
 
         logger.info(f"Added YouTube user: {user_data['email']}")
 
@@ -175,15 +216,27 @@ async def list_users():
 async def delete_user(user_id: str):
     """Remove a YouTube user and all their playlists."""
     with _get_session() as session:
-        user = session.get(YouTubeUser, user_id)
-        if not user:
-            raise HTTPException(status_code=404, detail="User not found")
+        # Bulk deletes bypass ORM cascades and SQLite doesn't enforce foreign
+        # keys, so remove the user's playlist items and playlists explicitly
+        user_playlists = select(YouTubePlaylist.id).where(YouTubePlaylist.user_id == user_id)
+        session.execute(
+            delete(YouTubePlaylistItem).where(YouTubePlaylistItem.playlist_id.in_(user_playlists))
+        )
+        session.execute(delete(YouTubePlaylist).where(YouTubePlaylist.user_id == user_id))
 
-        email = user.email
-        session.delete(user)
+        # DELETE ... RETURNING doubles as the existence check
+        stmt = (
+            delete(YouTubeUser)
+            .where(YouTubeUser.id == user_id)
+            .returning(YouTubeUser.email)
+        )
+        row = session.execute(stmt).first()
         session.commit()
 
-        logger.info(f"Deleted YouTube user: {email}")
+        if row is None:
+            raise HTTPException(status_code=404, detail="User not found")
+
+        logger.info(f"Deleted YouTube user: {row.email}")
         return {"status": "deleted", "user_id": user_id}
 
 
@@ -191,17 +244,40 @@ async def delete_user(user_id: str):
 
 
 @router.get("/playlists", response_model=YouTubeAllPlaylistsResponse)
-async def list_all_playlists():
-    """List all playlists grouped by user."""
+async def list_all_playlists(
+    limit: int = Query(default=100, ge=1, le=500, description="Users per page (max 500)"),
+    offset: int = Query(default=0, ge=0),
+):
+    """List all playlists grouped by user, paginated by user."""
     with _get_session() as session:
-        # Get all users with their playlists
+        total_users = session.scalar(select(func.count(YouTubeUser.id))) or 0
+
+        # Get one page of users with their playlists
+        user_ids = (
+            select(YouTubeUser.id)
+            .order_by(YouTubeUser.display_name, YouTubeUser.id)
+            .limit(limit)
+            .offset(offset)
+        )
         stmt = (
             select(YouTubeUser)
             .options(joinedload(YouTubeUser.playlists))
-            .order_by(YouTubeUser.display_name)
+            .where(YouTubeUser.id.in_(user_ids))
+            .order_by(YouTubeUser.display_name, YouTubeUser.id)
         )
         users = session.scalars(stmt).unique().all()
 
+        # Count items by status for this page's playlists in one query
+        playlist_ids = [playlist.id for user in users for playlist in user.playlists]
+        counts_by_playlist = {}
+        if playlist_ids:
+            count_rows = session.execute(
+                _item_counts_by_playlist_select
+                .where(YouTubePlaylistItem.playlist_id.in_(playlist_ids))
+                .group_by(YouTubePlaylistItem.playlist_id)
+            ).all()
+            counts_by_playlist = {row.playlist_id: row for row in count_rows}
+
         user_groups = []
         total_playlists = 0
 
@@ -209,30 +285,7 @@ async def list_all_playlists():
             playlists = []
 
             for playlist in user.playlists:
-                # Count items by status
-                item_counts = session.execute(
-                    select(
-                        func.count(YouTubePlaylistItem.id).label("total"),
-                        func.sum(
-                            func.case(
-                                (YouTubePlaylistItem.download_status == YouTubeItemStatus.PENDING.value, 1),
-                                else_=0
-                            )
-                        ).label("pending"),
-                        func.sum(
-                            func.case(
-                                (YouTubePlaylistItem.download_status == YouTubeItemStatus.COMPLETED.value, 1),
-                                else_=0
-                            )
-                        ).label("completed"),
-                        func.sum(
-                            func.case(
-                                (YouTubePlaylistItem.download_status == YouTubeItemStatus.FAILED.value, 1),
-                                else_=0
-                            )
-                        ).label("failed"),
-                    ).where(YouTubePlaylistItem.playlist_id == playlist.id)
-                ).one()
+                item_counts = counts_by_playlist.get(playlist.id)
 
                 playlists.append(
                     YouTubePlaylistResponse(
@@ -247,10 +300,10 @@ async def list_all_playlists():
                         is_liked_songs=playlist.is_liked_songs,
                         jellyfin_playlist_id=playlist.jellyfin_playlist_id,
                         last_synced_at=playlist.last_synced_at,
-                        item_count=item_counts.total or 0,
-                        pending_count=item_counts.pending or 0,
-                        completed_count=item_counts.completed or 0,
-                        failed_count=item_counts.failed or 0,
+                        item_count=(item_counts.total or 0) if item_counts else 0,
+                        pending_count=(item_counts.pending or 0) if item_counts else 0,
+                        completed_count=(item_counts.completed or 0) if item_counts else 0,
+                        failed_count=(item_counts.failed or 0) if item_counts else 0,
                         created_at=playlist.created_at,
                         updated_at=playlist.updated_at,
                     )
@@ -270,17 +323,24 @@ async def list_all_playlists():
         return YouTubeAllPlaylistsResponse(
             users=user_groups,
             total_playlists=total_playlists,
+            total_users=total_users,
         )
 
 
 @router.get("/playlists/{playlist_id}", response_model=YouTubePlaylistDetailResponse)
 async def get_playlist_detail(
+    request: Request,
     playlist_id: str,
     status_filter: str | None = Query(None, description="Filter by status: pending, downloading, completed, failed"),
     limit: int = Query(default=100, ge=1, le=500),
     offset: int = Query(default=0, ge=0),
 ):
-    """Get detailed playlist information with items."""
+    """
+    Get detailed playlist information with items.
+
+    Send `Accept: application/x-ndjson` to stream the items one per line
+    instead of receiving a single JSON document.
+    """
     with _get_session() as session:
         # Get playlist with user
         stmt = (
@@ -295,27 +355,7 @@ async def get_playlist_detail(
 
         # Count items by status
         item_counts = session.execute(
-            select(
-                func.count(YouTubePlaylistItem.id).label("total"),
-                func.sum(
-                    func.case(
-                        (YouTubePlaylistItem.download_status == YouTubeItemStatus.PENDING.value, 1),
-                        else_=0
-                    )
-                ).label("pending"),
-                func.sum(
-                    func.case(
-                        (YouTubePlaylistItem.download_status == YouTubeItemStatus.COMPLETED.value, 1),
-                        else_=0
-                    )
-                ).label("completed"),
-                func.sum(
-                    func.case(
-                        (YouTubePlaylistItem.download_status == YouTubeItemStatus.FAILED.value, 1),
-                        else_=0
-                    )
-                ).label("failed"),
-            ).where(YouTubePlaylistItem.playlist_id == playlist_id)
+            _item_counts_select.where(YouTubePlaylistItem.playlist_id == playlist_id)
         ).one()
 
         playlist_response = YouTubePlaylistResponse(
@@ -351,26 +391,30 @@ async def get_playlist_detail(
             )
 
         items_stmt = items_stmt.limit(limit).offset(offset)
-        items = session.scalars(items_stmt).all()
 
-        items_response = [
-            YouTubePlaylistItemResponse(
-                id=item.id,
-                playlist_id=item.playlist_id,
-                youtube_video_id=item.youtube_video_id,
-                title=item.title,
-                artist=item.artist,
-                position=item.position,
-                download_status=YouTubeItemStatus(item.download_status),
-                download_id=item.download_id,
-                file_path=item.file_path,
-                added_to_playlist_at=item.added_to_playlist_at,
-                downloaded_at=item.downloaded_at,
-                created_at=item.created_at,
-                updated_at=item.updated_at,
+        if "application/x-ndjson" in request.headers.get("accept", ""):
+            return StreamingResponse(
+                _stream_playlist_items(playlist_response, item_counts.total or 0, items_stmt),
+                media_type="application/x-ndjson",
             )
-            for item in items
-        ]
+
+        # A filter with no matching rows needs no page query at all
+        if status_filter and session.scalar(
+            select(literal(1))
+            .where(
+                YouTubePlaylistItem.playlist_id == playlist_id,
+                YouTubePlaylistItem.download_status == status_filter,
+            )
+            .limit(1)
+        ) is None:
+            return YouTubePlaylistDetailResponse(
+                playlist=playlist_response,
+                items=[],
+                total_items=item_counts.total or 0,
+            )
+
+        items = session.scalars(items_stmt).all()
+        items_response = [YouTubePlaylistItemResponse.model_validate(item) for item in items]
 
         return YouTubePlaylistDetailResponse(
             playlist=playlist_response,
@@ -401,27 +445,7 @@ async def update_playlist(playlist_id: str, update: YouTubePlaylistUpdate):
 
         # Get counts for response
         item_counts = session.execute(
-            select(
-                func.count(YouTubePlaylistItem.id).label("total"),
-                func.sum(
-                    func.case(
-                        (YouTubePlaylistItem.download_status == YouTubeItemStatus.PENDING.value, 1),
-                        else_=0
-                    )
-                ).label("pending"),
-                func.sum(
-                    func.case(
-                        (YouTubePlaylistItem.download_status == YouTubeItemStatus.COMPLETED.value, 1),
-                        else_=0
-                    )
-                ).label("completed"),
-                func.sum(
-                    func.case(
-                        (YouTubePlaylistItem.download_status == YouTubeItemStatus.FAILED.value, 1),
-                        else_=0
-                    )
-                ).label("failed"),
-            ).where(YouTubePlaylistItem.playlist_id == playlist_id)
+            _item_counts_select.where(YouTubePlaylistItem.playlist_id == playlist_id)
         ).one()
 
         return YouTubePlaylistResponse(
@@ -473,11 +497,12 @@ async def sync_playlist(playlist_id: str, background_tasks: BackgroundTasks):
 @router.get("/sync/status", response_model=YouTubeSyncStatusResponse)
 async def get_sync_status():
     """Get current sync status."""
+    now = datetime.now(timezone.utc)
     with _get_session() as session:
         # Check quota
         quota_stmt = (
             select(YouTubeQuota)
-            .where(YouTubeQuota.reset_date >= datetime.now(timezone.utc))
+            .where(YouTubeQuota.reset_date >= now)
             .order_by(YouTubeQuota.created_at.desc())
             .limit(1)
         )
@@ -487,7 +512,7 @@ async def get_sync_status():
         quota_reset_at = None
 
         if quota and quota.quota_exceeded_until:
-            if datetime.now(timezone.utc) < quota.quota_exceeded_until:
+            if now < quota.quota_exceeded_until:
                 quota_exceeded = True
                 quota_reset_at = quota.quota_exceeded_until
 
@@ -505,10 +530,11 @@ async def get_sync_status():
 @router.get("/quota", response_model=YouTubeQuotaResponse)
 async def get_quota_info():
     """Get YouTube API quota information."""
+    now = datetime.now(timezone.utc)
     with _get_session() as session:
         stmt = (
             select(YouTubeQuota)
-            .where(YouTubeQuota.reset_date >= datetime.now(timezone.utc))
+            .where(YouTubeQuota.reset_date >= now)
             .order_by(YouTubeQuota.created_at.desc())
             .limit(1)
         )
@@ -520,12 +546,12 @@ async def get_quota_info():
                 units_used=0,
                 units_remaining=10000,
                 quota_exceeded=False,
-                reset_date=datetime.now(timezone.utc),
+                reset_date=now,
             )
 
         quota_exceeded = False
         if quota.quota_exceeded_until:
-            if datetime.now(timezone.utc) < quota.quota_exceeded_until:
+            if now < quota.quota_exceeded_until:
                 quota_exceeded = True
 
         return YouTubeQuotaResponse(
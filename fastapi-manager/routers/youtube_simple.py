@@ -2,17 +2,21 @@
 
 import logging
 import os
+import re
+import time
 from datetime import datetime, timezone
 from pathlib import Path
 from uuid import uuid4
 
-from fastapi import APIRouter, HTTPException, Query, BackgroundTasks, UploadFile, File
+from fastapi import APIRouter, HTTPException, Query, UploadFile, File
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import JSONResponse
-from sqlalchemy import select, func, case
+from sqlalchemy import select, exists, insert
+from sqlalchemy.exc import IntegrityError
 
 from config import settings
 from database import SessionLocal
-from models.db import YouTubeConfig, YouTubePlaylist, YouTubePlaylistItem
+from models.db import YouTubeConfig, YouTubePlaylist, YouTubePlaylistItem, YouTubePlaylistStatusCounts
 from models.youtube_simple import (
     YouTubeConfigResponse,
     YouTubePlaylistCreate,
@@ -21,20 +25,109 @@ from models.youtube_simple import (
     YouTubePlaylistDetailResponse,
     YouTubePlaylistItemResponse,
     YouTubeSyncStatusResponse,
-    YouTubeItemStatus,
     DownloadType,
 )
+from services.youtube_extractor import extract_playlist_info
+from services.youtube_sync_simple import youtube_sync_simple
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Cookie uploads are streamed to disk in chunks of this size
+_UPLOAD_CHUNK_SIZE = 64 * 1024
+# Either marker is enough to accept an upload as a YouTube cookies file
+_COOKIE_MARKER = re.compile(rb"# Netscape HTTP Cookie File|youtube\.com")
+# Bytes carried between chunks so a marker split across them still matches
+_COOKIE_MARKER_OVERLAP = len(b"# Netscape HTTP Cookie File") - 1
+
+# GET /config is polled by the UI; cache the singleton config row briefly.
+# Writes in this module invalidate it immediately.
+_CONFIG_TTL = 30
+_config_cache: tuple[YouTubeConfigResponse, float] | None = None
+
 
 def _get_session():
     """Get database session."""
     return SessionLocal()
 
 
-async def _create_liked_playlist_if_not_exists() -> str | None:
+# Columns backing YouTubePlaylistItemResponse, selected without loading ORM objects
+_ITEM_RESPONSE_COLUMNS = (
+    YouTubePlaylistItem.id,
+    YouTubePlaylistItem.playlist_id,
+    YouTubePlaylistItem.youtube_video_id,
+    YouTubePlaylistItem.title,
+    YouTubePlaylistItem.artist,
+    YouTubePlaylistItem.position,
+    YouTubePlaylistItem.download_status,
+    YouTubePlaylistItem.download_id,
+    YouTubePlaylistItem.file_path,
+    YouTubePlaylistItem.added_to_playlist_at,
+    YouTubePlaylistItem.downloaded_at,
+    YouTubePlaylistItem.created_at,
+    YouTubePlaylistItem.updated_at,
+)
+
+
+# Playlists together with their trigger-maintained item counts, built once
+# at import so every request reuses the same statement (and SQLAlchemy's
+# compiled form of it); callers add their own .where() / .order_by()
+_PLAYLISTS_WITH_COUNTS = select(
+    YouTubePlaylist,
+    YouTubePlaylistStatusCounts.total,
+    YouTubePlaylistStatusCounts.pending,
+    YouTubePlaylistStatusCounts.completed,
+    YouTubePlaylistStatusCounts.failed,
+).outerjoin(
+    YouTubePlaylistStatusCounts,
+    YouTubePlaylistStatusCounts.playlist_id == YouTubePlaylist.id,
+)
+
+
+def _playlist_response(playlist: YouTubePlaylist, counts=None) -> YouTubePlaylistResponse:
+    """Build the API response for a playlist.
+
+    Args:
+        playlist: The playlist row
+        counts: A `_PLAYLISTS_WITH_COUNTS` row, or None to report zero counts
+    """
+    return YouTubePlaylistResponse(
+        id=playlist.id,
+        url=playlist.url,
+        youtube_playlist_id=playlist.youtube_playlist_id,
+        title=playlist.title,
+        description=playlist.description,
+        download_type=DownloadType(playlist.download_type),
+        jellyfin_playlist_id=playlist.jellyfin_playlist_id,
+        last_synced_at=playlist.last_synced_at,
+        item_count=(counts.total or 0) if counts else 0,
+        pending_count=(counts.pending or 0) if counts else 0,
+        completed_count=(counts.completed or 0) if counts else 0,
+        failed_count=(counts.failed or 0) if counts else 0,
+        created_at=playlist.created_at,
+        updated_at=playlist.updated_at,
+    )
+
+
+def _insert_playlist_row(session, **values) -> YouTubePlaylist:
+    """
+    Insert a playlist row and return it without a follow-up SELECT.
+
+    Uses INSERT ... RETURNING where the SQLite build supports it, otherwise
+    falls back to an ORM add + flush. The caller commits.
+    """
+    if session.get_bind().dialect.insert_returning:
+        return session.scalars(
+            insert(YouTubePlaylist).values(**values).returning(YouTubePlaylist)
+        ).one()
+
+    playlist = YouTubePlaylist(**values)
+    session.add(playlist)
+    session.flush()
+    return playlist
+
+
+def _create_liked_playlist_if_not_exists() -> str | None:
     """
     Check if Liked Videos playlist exists, create if not.
 
@@ -46,37 +139,40 @@ async def _create_liked_playlist_if_not_exists() -> str | None:
     liked_playlist_id = "LL"
 
     with _get_session() as session:
-        # Check if Liked playlist already exists
-        existing = session.scalar(
-            select(YouTubePlaylist).where(
-                (YouTubePlaylist.youtube_playlist_id == liked_playlist_id) |
-                (YouTubePlaylist.url == liked_url)
-            )
+        # Check if Liked playlist already exists (ID only, no row hydration)
+        existing_stmt = select(YouTubePlaylist.id).where(
+            (YouTubePlaylist.youtube_playlist_id == liked_playlist_id) |
+            (YouTubePlaylist.url == liked_url)
         )
+        existing_id = session.scalar(existing_stmt)
 
-        if existing:
-            logger.info(f"Liked Videos playlist already exists: {existing.id}")
-            return existing.id
+        if existing_id:
+            logger.info(f"Liked Videos playlist already exists: {existing_id}")
+            return existing_id
 
         # Create the Liked Videos playlist
+        now = datetime.now(timezone.utc)
         try:
-            playlist = YouTubePlaylist(
+            playlist_id = _insert_playlist_row(
+                session,
                 id=str(uuid4()),
                 url=liked_url,
                 youtube_playlist_id=liked_playlist_id,
                 title="Liked Videos",
                 description="Your liked YouTube videos (automatically synced)",
                 download_type=DownloadType.AUDIO.value,
-                created_at=datetime.now(timezone.utc),
-                updated_at=datetime.now(timezone.utc),
-            )
-
-            session.add(playlist)
+                created_at=now,
+                updated_at=now,
+            ).id
             session.commit()
-            session.refresh(playlist)
 
-            logger.info(f"Created Liked Videos playlist: {playlist.id}")
-            return playlist.id
+            logger.info(f"Created Liked Videos playlist: {playlist_id}")
+            return playlist_id
+
+        except IntegrityError:
+            # Created concurrently; the unique indexes rejected our copy
+            session.rollback()
+            return session.scalar(existing_stmt)
 
         except Exception as e:
             logger.error(f"Failed to create Liked Videos playlist: {e}")
@@ -87,26 +183,63 @@ async def _create_liked_playlist_if_not_exists() -> str | None:
 # Cookie Management
 
 
+def _invalidate_config_cache() -> None:
+    """Drop the cached config response after the config row changes."""
+    global _config_cache
+    _config_cache = None
+
+
 @router.get("/config", response_model=YouTubeConfigResponse)
-async def get_config():
+def get_config():
     """Get YouTube configuration status (cookies uploaded, etc)."""
+    global _config_cache
+
+    cached = _config_cache
+    if cached and time.monotonic() - cached[1] < _CONFIG_TTL:
+        return cached[0]
+
     with _get_session() as session:
         config = session.scalar(select(YouTubeConfig).limit(1))
 
         if not config:
-            return YouTubeConfigResponse(
+            response = YouTubeConfigResponse(
                 cookies_uploaded=False,
                 cookies_uploaded_at=None
             )
+        else:
+            response = YouTubeConfigResponse(
+                cookies_uploaded=config.cookies_uploaded,
+                cookies_uploaded_at=config.cookies_uploaded_at
+            )
 
-        return YouTubeConfigResponse(
-            cookies_uploaded=config.cookies_uploaded,
-            cookies_uploaded_at=config.cookies_uploaded_at
-        )
+    _config_cache = (response, time.monotonic())
+    return response
+
+
+def _mark_cookies_uploaded() -> None:
+    """Record in the config row that cookies have been uploaded."""
+    now = datetime.now(timezone.utc)
+    with _get_session() as session:
+        config = session.scalar(select(YouTubeConfig).limit(1))
+
+        if config:
+            config.cookies_uploaded = True
+            config.cookies_uploaded_at = now
+            config.updated_at = now
+        else:
+            config = YouTubeConfig(
+                cookies_uploaded=True,
+                cookies_uploaded_at=now,
+            )
+            session.add(config)
+
+        session.commit()
+
+    _invalidate_config_cache()
 
 
 @router.post("/upload-cookies")
-async def upload_cookies(background_tasks: BackgroundTasks, file: UploadFile = File(...)):
+async def upload_cookies(file: UploadFile = File(...)):
     """
     Upload YouTube cookies.txt file.
 
@@ -116,60 +249,50 @@ async def upload_cookies(background_tasks: BackgroundTasks, file: UploadFile = F
     if not file.filename.endswith('.txt'):
         raise HTTPException(status_code=400, detail="File must be a .txt file")
 
-    # Read file content
-    try:
-        content = await file.read()
-        content_str = content.decode('utf-8')
-
-        # Basic validation - check if it looks like a Netscape cookies file
-        if '# Netscape HTTP Cookie File' not in content_str and 'youtube.com' not in content_str:
-            raise HTTPException(
-                status_code=400,
-                detail="This doesn't look like a valid YouTube cookies file. Make sure to export cookies for youtube.com"
-            )
-
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Failed to read file: {str(e)}")
-
-    # Save cookies to configured location
+    # Stream the upload to a temporary file next to the destination,
+    # validating as chunks arrive, then swap it into place
     cookies_path = Path(settings.YOUTUBE_COOKIES_FILE)
     cookies_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = cookies_path.with_name(cookies_path.name + ".upload")
+
+    looks_valid = False
+    tail = b""
 
     try:
-        with open(cookies_path, 'wb') as f:
-            f.write(content)
+        with open(tmp_path, 'wb') as f:
+            while chunk := await file.read(_UPLOAD_CHUNK_SIZE):
+                # Basic validation - check if it looks like a Netscape cookies file
+                if not looks_valid:
+                    looks_valid = _COOKIE_MARKER.search(tail + chunk) is not None
+                    tail = chunk[-_COOKIE_MARKER_OVERLAP:]
 
-        logger.info(f"Saved YouTube cookies to {cookies_path}")
+                f.write(chunk)
 
     except Exception as e:
+        tmp_path.unlink(missing_ok=True)
         logger.error(f"Failed to save cookies: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to save cookies: {str(e)}")
 
-    # Update config in database
-    with _get_session() as session:
-        config = session.scalar(select(YouTubeConfig).limit(1))
+    if not looks_valid:
+        tmp_path.unlink(missing_ok=True)
+        raise HTTPException(
+            status_code=400,
+            detail="This doesn't look like a valid YouTube cookies file. Make sure to export cookies for youtube.com"
+        )
 
-        if config:
-            config.cookies_uploaded = True
-            config.cookies_uploaded_at = datetime.now(timezone.utc)
-            config.updated_at = datetime.now(timezone.utc)
-        else:
-            config = YouTubeConfig(
-                cookies_uploaded=True,
-                cookies_uploaded_at=datetime.now(timezone.utc),
-            )
-            session.add(config)
+    os.replace(tmp_path, cookies_path)
+    logger.info(f"Saved YouTube cookies to {cookies_path}")
 
-        session.commit()
+    # Update config in database
+    await run_in_threadpool(_mark_cookies_uploaded)
 
     # Automatically create Liked Videos playlist if it doesn't exist
     try:
-        liked_playlist_id = await _create_liked_playlist_if_not_exists()
+        liked_playlist_id = await run_in_threadpool(_create_liked_playlist_if_not_exists)
         if liked_playlist_id:
             logger.info(f"Automatically created Liked Videos playlist: {liked_playlist_id}")
-            # Trigger background sync for the Liked playlist
-            from services.youtube_sync_simple import sync_playlist_items
-            background_tasks.add_task(sync_playlist_items, liked_playlist_id)
+            # Queue a sync for the Liked playlist
+            youtube_sync_simple.enqueue_playlist(liked_playlist_id)
     except Exception as e:
         # Don't fail the cookie upload if Liked playlist creation fails
         logger.warning(f"Failed to auto-create Liked Videos playlist: {e}")
@@ -178,7 +301,7 @@ async def upload_cookies(background_tasks: BackgroundTasks, file: UploadFile = F
 
 
 @router.delete("/cookies")
-async def delete_cookies():
+def delete_cookies():
     """Delete uploaded cookies."""
     cookies_path = Path(settings.YOUTUBE_COOKIES_FILE)
 
@@ -199,6 +322,8 @@ async def delete_cookies():
             config.updated_at = datetime.now(timezone.utc)
             session.commit()
 
+    _invalidate_config_cache()
+
     return {"status": "success", "message": "Cookies deleted"}
 
 
@@ -206,64 +331,66 @@ async def delete_cookies():
 
 
 @router.get("/playlists", response_model=list[YouTubePlaylistResponse])
-async def list_playlists():
+def list_playlists(
+    include_counts: bool = Query(True, description="Set false to skip item counts (reported as 0)"),
+):
     """List all manually added playlists."""
     with _get_session() as session:
-        playlists = session.scalars(
-            select(YouTubePlaylist).order_by(YouTubePlaylist.created_at.desc())
+        if not include_counts:
+            playlists = session.scalars(
+                select(YouTubePlaylist).order_by(YouTubePlaylist.created_at.desc())
+            ).all()
+            return [_playlist_response(playlist) for playlist in playlists]
+
+        rows = session.execute(
+            _PLAYLISTS_WITH_COUNTS.order_by(YouTubePlaylist.created_at.desc())
         ).all()
 
-        result = []
-        for playlist in playlists:
-            # Count items by status
-            item_counts = session.execute(
-                select(
-                    func.count(YouTubePlaylistItem.id).label("total"),
-                    func.sum(
-                        case(
-                            (YouTubePlaylistItem.download_status == YouTubeItemStatus.PENDING.value, 1),
-                            else_=0
-                        )
-                    ).label("pending"),
-                    func.sum(
-                        case(
-                            (YouTubePlaylistItem.download_status == YouTubeItemStatus.COMPLETED.value, 1),
-                            else_=0
-                        )
-                    ).label("completed"),
-                    func.sum(
-                        case(
-                            (YouTubePlaylistItem.download_status == YouTubeItemStatus.FAILED.value, 1),
-                            else_=0
-                        )
-                    ).label("failed"),
-                ).where(YouTubePlaylistItem.playlist_id == playlist.id)
-            ).one()
-
-            result.append(
-                YouTubePlaylistResponse(
-                    id=playlist.id,
-                    url=playlist.url,
-                    youtube_playlist_id=playlist.youtube_playlist_id,
-                    title=playlist.title,
-                    description=playlist.description,
-                    download_type=DownloadType(playlist.download_type),
-                    jellyfin_playlist_id=playlist.jellyfin_playlist_id,
-                    last_synced_at=playlist.last_synced_at,
-                    item_count=item_counts.total or 0,
-                    pending_count=item_counts.pending or 0,
-                    completed_count=item_counts.completed or 0,
-                    failed_count=item_counts.failed or 0,
-                    created_at=playlist.created_at,
-                    updated_at=playlist.updated_at,
+        return [_playlist_response(row.YouTubePlaylist, row) for row in rows]
+
+
+def _insert_playlist(request: YouTubePlaylistCreate, playlist_info: dict) -> YouTubePlaylistResponse:
+    """Insert a new playlist row, rejecting duplicates. Returns the response for the stored row."""
+    now = datetime.now(timezone.utc)
+    with _get_session() as session:
+        # Check if playlist already exists
+        already_added = session.scalar(
+            select(
+                exists().where(
+                    (YouTubePlaylist.url == request.url) |
+                    (YouTubePlaylist.youtube_playlist_id == playlist_info.get("playlist_id"))
                 )
             )
+        )
 
-        return result
+        if already_added:
+            raise HTTPException(status_code=400, detail="This playlist has already been added")
+
+        try:
+            playlist = _insert_playlist_row(
+                session,
+                id=str(uuid4()),
+                url=request.url,
+                youtube_playlist_id=playlist_info.get("playlist_id"),
+                title=playlist_info.get("title", "Unknown Playlist"),
+                description=playlist_info.get("description"),
+                download_type=request.download_type.value,
+                created_at=now,
+                updated_at=now,
+            )
+            # Build the response before commit expires the loaded attributes
+            playlist_response = _playlist_response(playlist)
+            session.commit()
+        except IntegrityError:
+            # Lost a race with a concurrent add; the unique indexes caught it
+            session.rollback()
+            raise HTTPException(status_code=400, detail="This playlist has already been added")
+
+        return playlist_response
 
 
 @router.post("/playlists", response_model=YouTubePlaylistResponse)
-async def add_playlist(request: YouTubePlaylistCreate, background_tasks: BackgroundTasks):
+async def add_playlist(request: YouTubePlaylistCreate):
     """
     Manually add a YouTube playlist by URL.
 
@@ -277,9 +404,6 @@ async def add_playlist(request: YouTubePlaylistCreate, background_tasks: Backgro
             detail="Please upload YouTube cookies first before adding playlists"
         )
 
-    # Import here to avoid circular import
-    from services.youtube_extractor import extract_playlist_info
-
     # Extract playlist info using yt-dlp
     try:
         playlist_info = await extract_playlist_info(request.url)
@@ -291,116 +415,41 @@ async def add_playlist(request: YouTubePlaylistCreate, background_tasks: Backgro
         )
 
     # Create playlist in database
-    with _get_session() as session:
-        # Check if playlist already exists
-        existing = session.scalar(
-            select(YouTubePlaylist).where(
-                (YouTubePlaylist.url == request.url) |
-                (YouTubePlaylist.youtube_playlist_id == playlist_info.get("playlist_id"))
-            )
-        )
+    playlist_response = await run_in_threadpool(_insert_playlist, request, playlist_info)
 
-        if existing:
-            raise HTTPException(status_code=400, detail="This playlist has already been added")
+    # Queue extraction of playlist items for the sync worker
+    youtube_sync_simple.enqueue_playlist(playlist_response.id)
 
-        playlist = YouTubePlaylist(
-            id=str(uuid4()),
-            url=request.url,
-            youtube_playlist_id=playlist_info.get("playlist_id"),
-            title=playlist_info.get("title", "Unknown Playlist"),
-            description=playlist_info.get("description"),
-            download_type=request.download_type.value,
-            created_at=datetime.now(timezone.utc),
-            updated_at=datetime.now(timezone.utc),
-        )
-
-        session.add(playlist)
-        session.commit()
-        session.refresh(playlist)
-
-        playlist_id = playlist.id
-
-    # Trigger background extraction of playlist items
-    from services.youtube_sync_simple import sync_playlist_items
-    background_tasks.add_task(sync_playlist_items, playlist_id)
-
-    return YouTubePlaylistResponse(
-        id=playlist_id,
-        url=request.url,
-        youtube_playlist_id=playlist_info.get("playlist_id"),
-        title=playlist_info.get("title", "Unknown Playlist"),
-        description=playlist_info.get("description"),
-        download_type=request.download_type,
-        jellyfin_playlist_id=None,
-        last_synced_at=None,
-        item_count=0,
-        pending_count=0,
-        completed_count=0,
-        failed_count=0,
-        created_at=datetime.now(timezone.utc),
-        updated_at=datetime.now(timezone.utc),
-    )
+    return playlist_response
 
 
 @router.get("/playlists/{playlist_id}", response_model=YouTubePlaylistDetailResponse)
-async def get_playlist_detail(
+def get_playlist_detail(
     playlist_id: str,
     status_filter: str | None = Query(None),
     limit: int = Query(default=100, ge=1, le=500),
     offset: int = Query(default=0, ge=0),
+    include_counts: bool = Query(True, description="Set false to skip item counts (reported as 0)"),
 ):
     """Get detailed playlist with items."""
     with _get_session() as session:
-        playlist = session.get(YouTubePlaylist, playlist_id)
+        if include_counts:
+            counts = session.execute(
+                _PLAYLISTS_WITH_COUNTS.where(YouTubePlaylist.id == playlist_id)
+            ).one_or_none()
+            playlist = counts.YouTubePlaylist if counts else None
+        else:
+            counts = None
+            playlist = session.get(YouTubePlaylist, playlist_id)
 
         if not playlist:
             raise HTTPException(status_code=404, detail="Playlist not found")
 
-        # Count items
-        item_counts = session.execute(
-            select(
-                func.count(YouTubePlaylistItem.id).label("total"),
-                func.sum(
-                    case(
-                        (YouTubePlaylistItem.download_status == YouTubeItemStatus.PENDING.value, 1),
-                        else_=0
-                    )
-                ).label("pending"),
-                func.sum(
-                    case(
-                        (YouTubePlaylistItem.download_status == YouTubeItemStatus.COMPLETED.value, 1),
-                        else_=0
-                    )
-                ).label("completed"),
-                func.sum(
-                    case(
-                        (YouTubePlaylistItem.download_status == YouTubeItemStatus.FAILED.value, 1),
-                        else_=0
-                    )
-                ).label("failed"),
-            ).where(YouTubePlaylistItem.playlist_id == playlist_id)
-        ).one()
+        playlist_response = _playlist_response(playlist, counts)
 
-        playlist_response = YouTubePlaylistResponse(
-            id=playlist.id,
-            url=playlist.url,
-            youtube_playlist_id=playlist.youtube_playlist_id,
-            title=playlist.title,
-            description=playlist.description,
-            download_type=DownloadType(playlist.download_type),
-            jellyfin_playlist_id=playlist.jellyfin_playlist_id,
-            last_synced_at=playlist.last_synced_at,
-            item_count=item_counts.total or 0,
-            pending_count=item_counts.pending or 0,
-            completed_count=item_counts.completed or 0,
-            failed_count=item_counts.failed or 0,
-            created_at=playlist.created_at,
-            updated_at=playlist.updated_at,
-        )
-
-        # Get items
+        # Get items as plain column rows (no ORM identity map)
         items_stmt = (
-            select(YouTubePlaylistItem)
+            select(*_ITEM_RESPONSE_COLUMNS)
             .where(YouTubePlaylistItem.playlist_id == playlist_id)
             .order_by(YouTubePlaylistItem.position)
         )
@@ -410,37 +459,24 @@ async def get_playlist_detail(
                 YouTubePlaylistItem.download_status == status_filter
             )
 
-        items_stmt = items_stmt.limit(limit).offset(offset)
-        items = session.scalars(items_stmt).all()
-
+        items_stmt = (
+            items_stmt.limit(limit).offset(offset)
+            .execution_options(yield_per=128)
+        )
         items_response = [
-            YouTubePlaylistItemResponse(
-                id=item.id,
-                playlist_id=item.playlist_id,
-                youtube_video_id=item.youtube_video_id,
-                title=item.title,
-                artist=item.artist,
-                position=item.position,
-                download_status=YouTubeItemStatus(item.download_status),
-                download_id=item.download_id,
-                file_path=item.file_path,
-                added_to_playlist_at=item.added_to_playlist_at,
-                downloaded_at=item.downloaded_at,
-                created_at=item.created_at,
-                updated_at=item.updated_at,
-            )
-            for item in items
+            YouTubePlaylistItemResponse(**item._mapping)
+            for item in session.execute(items_stmt)
         ]
 
         return YouTubePlaylistDetailResponse(
             playlist=playlist_response,
             items=items_response,
-            total_items=item_counts.total or 0,
+            total_items=playlist_response.item_count,
         )
 
 
 @router.patch("/playlists/{playlist_id}", response_model=YouTubePlaylistResponse)
-async def update_playlist(playlist_id: str, update: YouTubePlaylistUpdate):
+def update_playlist(playlist_id: str, update: YouTubePlaylistUpdate):
     """Update playlist settings (download type)."""
     with _get_session() as session:
         playlist = session.get(YouTubePlaylist, playlist_id)
@@ -453,53 +489,17 @@ async def update_playlist(playlist_id: str, update: YouTubePlaylistUpdate):
 
         playlist.updated_at = datetime.now(timezone.utc)
         session.commit()
-        session.refresh(playlist)
 
-        # Get counts
-        item_counts = session.execute(
-            select(
-                func.count(YouTubePlaylistItem.id).label("total"),
-                func.sum(
-                    case(
-                        (YouTubePlaylistItem.download_status == YouTubeItemStatus.PENDING.value, 1),
-                        else_=0
-                    )
-                ).label("pending"),
-                func.sum(
-                    case(
-                        (YouTubePlaylistItem.download_status == YouTubeItemStatus.COMPLETED.value, 1),
-                        else_=0
-                    )
-                ).label("completed"),
-                func.sum(
-                    case(
-                        (YouTubePlaylistItem.download_status == YouTubeItemStatus.FAILED.value, 1),
-                        else_=0
-                    )
-                ).label("failed"),
-            ).where(YouTubePlaylistItem.playlist_id == playlist_id)
+        # Reload the playlist together with its counts
+        row = session.execute(
+            _PLAYLISTS_WITH_COUNTS.where(YouTubePlaylist.id == playlist_id)
         ).one()
 
-        return YouTubePlaylistResponse(
-            id=playlist.id,
-            url=playlist.url,
-            youtube_playlist_id=playlist.youtube_playlist_id,
-            title=playlist.title,
-            description=playlist.description,
-            download_type=DownloadType(playlist.download_type),
-            jellyfin_playlist_id=playlist.jellyfin_playlist_id,
-            last_synced_at=playlist.last_synced_at,
-            item_count=item_counts.total or 0,
-            pending_count=item_counts.pending or 0,
-            completed_count=item_counts.completed or 0,
-            failed_count=item_counts.failed or 0,
-            created_at=playlist.created_at,
-            updated_at=playlist.updated_at,
-        )
+        return _playlist_response(row.YouTubePlaylist, row)
 
 
 @router.delete("/playlists/{playlist_id}")
-async def delete_playlist(playlist_id: str):
+def delete_playlist(playlist_id: str):
     """Delete a playlist."""
     with _get_session() as session:
         playlist = session.get(YouTubePlaylist, playlist_id)
@@ -513,26 +513,26 @@ async def delete_playlist(playlist_id: str):
         return {"status": "deleted", "playlist_id": playlist_id}
 
 
-@router.post("/playlists/{playlist_id}/sync")
-async def sync_playlist(playlist_id: str, background_tasks: BackgroundTasks):
-    """Manually trigger sync for a playlist."""
+def _playlist_exists(playlist_id: str) -> bool:
+    """Check whether a playlist with this ID exists."""
     with _get_session() as session:
-        playlist = session.get(YouTubePlaylist, playlist_id)
+        return session.get(YouTubePlaylist, playlist_id) is not None
 
-        if not playlist:
-            raise HTTPException(status_code=404, detail="Playlist not found")
 
-    from services.youtube_sync_simple import sync_playlist_items
-    background_tasks.add_task(sync_playlist_items, playlist_id)
+@router.post("/playlists/{playlist_id}/sync")
+async def sync_playlist(playlist_id: str):
+    """Manually trigger sync for a playlist."""
+    if not await run_in_threadpool(_playlist_exists, playlist_id):
+        raise HTTPException(status_code=404, detail="Playlist not found")
+
+    youtube_sync_simple.enqueue_playlist(playlist_id)
 
     return {"status": "started", "message": f"Sync started for playlist {playlist_id}"}
 
 
 @router.post("/sync/all")
-async def sync_all_playlists(background_tasks: BackgroundTasks):
+async def sync_all_playlists():
     """Manually trigger sync for all playlists."""
-    from services.youtube_sync_simple import youtube_sync_simple
-
     if youtube_sync_simple.is_running:
         raise HTTPException(status_code=400, detail="Sync is already running")
 
@@ -544,7 +544,8 @@ async def sync_all_playlists(background_tasks: BackgroundTasks):
             detail="YouTube cookies not uploaded. Please upload cookies first."
         )
 
-    background_tasks.add_task(youtube_sync_simple.sync_all_playlists)
+    if not youtube_sync_simple.enqueue_all_playlists():
+        raise HTTPException(status_code=400, detail="Sync is already queued")
 
     return {"status": "started", "message": "Sync started for all playlists"}
 
@@ -552,12 +553,10 @@ async def sync_all_playlists(background_tasks: BackgroundTasks):
 @router.get("/sync/status", response_model=YouTubeSyncStatusResponse)
 async def get_sync_status():
     """Get current sync status."""
-    # Import to avoid circular dependency
-    from services.youtube_sync_simple import youtube_sync_simple
-
     return YouTubeSyncStatusResponse(
         is_running=youtube_sync_simple.is_running,
         current_playlist_id=youtube_sync_simple.current_playlist_id,
         current_playlist_title=youtube_sync_simple.current_playlist_title,
+        active_playlists=dict(youtube_sync_simple.active_playlists),
         progress_message=youtube_sync_simple.progress_message,
     )
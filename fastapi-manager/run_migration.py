@@ -29,9 +29,15 @@ def main():
         return 1
 
     logger.info(f"Connecting to database: {db_path}")
-    conn = sqlite3.connect(db_path)
+    # Autocommit mode so the DROPs below can be grouped in one explicit transaction
+    conn = sqlite3.connect(db_path, isolation_level=None)
     cursor = conn.cursor()
 
+    # Avoid an fsync per statement on slow SD cards
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+
     try:
         # Check if youtube_playlists table exists
         cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='youtube_playlists'")
@@ -58,11 +64,11 @@ def main():
             logger.info("Converting to cookie-based YouTube playlist schema...")
 
             # Check if there's any data
-            cursor.execute("SELECT COUNT(*) FROM youtube_playlists")
-            row_count = cursor.fetchone()[0]
+            cursor.execute("SELECT EXISTS(SELECT 1 FROM youtube_playlists)")
+            has_rows = cursor.fetchone()[0]
 
-            if row_count > 0:
-                logger.warning(f"⚠️  Found {row_count} playlists in old schema - these will be DELETED during migration")
+            if has_rows:
+                logger.warning("⚠️  Found playlists in old schema - these will be DELETED during migration")
                 response = input("Continue? (yes/no): ")
                 if response.lower() != 'yes':
                     logger.info("Migration cancelled")
@@ -70,6 +76,7 @@ def main():
 
             # Drop old tables
             logger.info("Dropping old OAuth-based YouTube tables...")
+            cursor.execute("BEGIN")
             cursor.execute("DROP TABLE IF EXISTS youtube_playlist_items")
             logger.info("  ✓ Dropped youtube_playlist_items")
 
@@ -90,6 +97,7 @@ def main():
             logger.warning("Table has both user_id and url - this is unexpected!")
             logger.info("Dropping table to recreate with correct schema...")
 
+            cursor.execute("BEGIN")
             cursor.execute("DROP TABLE IF EXISTS youtube_playlist_items")
             cursor.execute("DROP TABLE IF EXISTS youtube_playlists")
             conn.commit()
@@ -97,6 +105,7 @@ def main():
 
         elif not has_url:
             logger.info("Table is missing url column - dropping and recreating...")
+            cursor.execute("BEGIN")
             cursor.execute("DROP TABLE IF EXISTS youtube_playlist_items")
             cursor.execute("DROP TABLE IF EXISTS youtube_playlists")
             conn.commit()
@@ -0,0 +1,114 @@
+"""Helpers for the log and history files kept in the data directory."""
+
+import os
+from pathlib import Path
+from typing import Optional
+
+import orjson
+
+
+def read_tail_lines(path: Path, count: int) -> list[str]:
+    """Read the last count lines of a text file without loading all of it.
+
+    Reads a window from the end of the file, doubling it until it holds
+    enough complete lines or reaches the start of the file.
+    """
+    with open(path, "rb") as f:
+        size = f.seek(0, os.SEEK_END)
+        window = max(count * 200, 64 * 1024)
+        while True:
+            start = max(0, size - window)
+            f.seek(start)
+            text = f.read().decode("utf-8", errors="replace")
+            if start > 0:
+                # Drop the partial line the window starts in
+                newline = text.find("\n")
+                if newline == -1:
+                    window *= 2
+                    continue
+                text = text[newline + 1:]
+            all_lines = text.strip().split("\n") if text.strip() else []
+            if start == 0 or len(all_lines) >= count:
+                return all_lines[-count:]
+            window *= 2
+
+
+class JsonlHistory:
+    """History entries appended to a JSON lines file.
+
+    Only the last `limit` entries are ever read. Once the file grows past
+    `compact_bytes` it is rewritten with just those entries. The parsed
+    entries are cached until the file's mtime or size changes.
+    """
+
+    def __init__(self, path: Path, legacy_path: Path, limit: int, compact_bytes: int):
+        self.path = path
+        self.legacy_path = legacy_path
+        self.limit = limit
+        self.compact_bytes = compact_bytes
+        # Parsed entries, keyed by the (mtime_ns, size) of the file they were read from
+        self._cache: Optional[tuple[tuple[int, int], list[dict]]] = None
+
+    def _file_key(self) -> Optional[tuple[int, int]]:
+        """Get the (mtime_ns, size) of the history file, or None if missing."""
+        try:
+            st = self.path.stat()
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _migrate_legacy(self) -> None:
+        """Convert a JSON array history file to the JSON lines format."""
+        if self.path.exists() or not self.legacy_path.exists():
+            return
+        try:
+            history = orjson.loads(self.legacy_path.read_bytes())
+        except (orjson.JSONDecodeError, OSError):
+            history = []
+        self.path.write_bytes(
+            b"".join(orjson.dumps(entry, default=str) + b"\n" for entry in history[-self.limit:])
+        )
+        self.legacy_path.unlink(missing_ok=True)
+
+    def load(self) -> list[dict]:
+        """Load the most recent history entries."""
+        self._migrate_legacy()
+        key = self._file_key()
+        if key is None:
+            return []
+
+        if self._cache is None or self._cache[0] != key:
+            try:
+                lines = read_tail_lines(self.path, self.limit)
+            except OSError:
+                return []
+            history = []
+            for line in lines:
+                try:
+                    history.append(orjson.loads(line))
+                except orjson.JSONDecodeError:
+                    continue
+            self._cache = (key, history)
+        return list(self._cache[1])
+
+    def append(self, entries: list[dict]) -> None:
+        """Append entries to the history file, compacting it if it grew too large."""
+        self._migrate_legacy()
+        key_before = self._file_key()
+        with open(self.path, "ab") as f:
+            for entry in entries:
+                f.write(orjson.dumps(entry, default=str) + b"\n")
+            size = f.tell()
+
+        if size > self.compact_bytes:
+            keep = read_tail_lines(self.path, self.limit)
+            tmp_file = self.path.with_suffix(".tmp")
+            tmp_file.write_text("".join(line + "\n" for line in keep))
+            os.replace(tmp_file, self.path)
+
+        # Extend the cache in place if it was current, otherwise reload next time
+        if self._cache is not None and self._cache[0] == key_before:
+            history = (self._cache[1] + entries)[-self.limit:]
+            self._cache = (self._file_key(), history)
+        else:
+            self._cache = None
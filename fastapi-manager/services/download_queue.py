@@ -1,17 +1,18 @@
 """Download queue manager with SQLAlchemy storage."""
 
 import asyncio
-import json
 import logging
+import time
 from datetime import datetime
-from typing import Optional
+from typing import Any, Optional
 from uuid import uuid4
 
-from sqlalchemy import select, or_
+from sqlalchemy import event, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from config import settings
-from database import SessionLocal, init_db
+from database import AsyncSessionLocal, init_db
 from models.db import Download
 from models.download import (
     DownloadJob,
@@ -28,6 +29,24 @@ from services.jellyfin import jellyfin_client
 
 logger = logging.getLogger(__name__)
 
+# Minimum spacing between persisted progress updates for a running job
+_PROGRESS_WRITE_INTERVAL = 0.5
+_PROGRESS_WRITE_MIN_DELTA = 1.0
+
+# Fallback re-check for pending jobs when the worker is not woken explicitly
+_WORKER_IDLE_TIMEOUT = 30
+
+_ACTIVE_STATUSES = Download.status.in_(
+    [DownloadStatus.DOWNLOADING.value, DownloadStatus.ANALYZING.value]
+)
+_HISTORY_STATUSES = Download.status.in_(
+    [
+        DownloadStatus.COMPLETED.value,
+        DownloadStatus.FAILED.value,
+        DownloadStatus.CANCELLED.value,
+    ]
+)
+
 
 class DownloadQueueManager:
     """Manages the download queue with SQLAlchemy persistence."""
@@ -36,29 +55,41 @@ class DownloadQueueManager:
         init_db()
         self._processing = False
         self._current_job_id: Optional[str] = None
+        # Cached queue/history responses, tagged with the write epoch they
+        # were read at. Any write bumps the epoch so stale entries miss.
+        self._epoch = 0
+        self._cache: dict[tuple, tuple[int, Any]] = {}
+        # Set whenever a job is queued so the idle worker picks it up at once
+        self._wakeup = asyncio.Event()
+
+    def _get_session(self) -> AsyncSession:
+        """Get a new async database session."""
+        return AsyncSessionLocal()
+
+    def _invalidate(self, *args):
+        """Drop cached queue/history responses after a write."""
+        self._epoch += 1
+        self._cache.clear()
+
+    def _job_committed(self, *args):
+        """Invalidate caches and wake the worker after a staged job commits."""
+        self._invalidate()
+        self._wakeup.set()
+
+    def _cached(self, key: tuple) -> Optional[Any]:
+        """Return a cached response if no write happened since it was read."""
+        cached = self._cache.get(key)
+        if cached and cached[0] == self._epoch:
+            return cached[1]
+        return None
 
-    def _get_session(self) -> Session:
-        """Get a new database session."""
-        return SessionLocal()
-
-    def add_job(
+    def _new_download(
         self,
         url: str,
         media_type: MediaType,
         metadata: MovieMetadata | TVMetadata | MusicMetadata,
-        session: Optional[Session] = None,
-    ) -> DownloadJob:
-        """Add a new download job to the queue.
-
-        Args:
-            url: URL to download
-            media_type: Type of media (movie/tv/music)
-            metadata: Metadata for the download
-            session: Optional existing session to use (avoids nested session locks)
-
-        Returns:
-            DownloadJob: The created job
-        """
+    ) -> tuple[Download, DownloadJob]:
+        """Build a pending Download row and its matching DownloadJob."""
         job_id = str(uuid4())
         now = datetime.now()
 
@@ -66,21 +97,11 @@ class DownloadQueueManager:
             id=job_id,
             url=url,
             media_type=media_type.value,
-            metadata_json=json.dumps(metadata.model_dump()),
             status=DownloadStatus.PENDING.value,
             created_at=now,
         )
-
-        if session is not None:
-            # Use existing session (don't commit - let caller handle it)
-            session.add(download)
-        else:
-            # Create new session and commit immediately
-            with self._get_session() as new_session:
-                new_session.add(download)
-                new_session.commit()
-
-        return DownloadJob(
+        download.set_metadata(metadata)
+        job = DownloadJob(
             id=job_id,
             url=url,
             media_type=media_type,
@@ -88,16 +109,63 @@ class DownloadQueueManager:
             status=DownloadStatus.PENDING,
             created_at=now,
         )
+        return download, job
+
+    def stage_job(
+        self,
+        session: Session,
+        url: str,
+        media_type: MediaType,
+        metadata: MovieMetadata | TVMetadata | MusicMetadata,
+    ) -> DownloadJob:
+        """Add a download job to an existing synchronous session.
+
+        The row is not committed - the caller commits it together with its
+        own changes (avoids nested session locks).
+
+        Returns:
+            DownloadJob: The created job
+        """
+        download, job = self._new_download(url, media_type, metadata)
+        session.add(download)
+        event.listen(session, "after_commit", self._job_committed, once=True)
+        return job
+
+    async def add_job(
+        self,
+        url: str,
+        media_type: MediaType,
+        metadata: MovieMetadata | TVMetadata | MusicMetadata,
+    ) -> DownloadJob:
+        """Add a new download job to the queue.
+
+        Args:
+            url: URL to download
+            media_type: Type of media (movie/tv/music)
+            metadata: Metadata for the download
+
+        Returns:
+            DownloadJob: The created job
+        """
+        download, job = self._new_download(url, media_type, metadata)
+
+        async with self._get_session() as session:
+            session.add(download)
+            await session.commit()
 
-    def get_job(self, job_id: str) -> Optional[DownloadJob]:
+        self._invalidate()
+        self._wakeup.set()
+        return job
+
+    async def get_job(self, job_id: str) -> Optional[DownloadJob]:
         """Get a job by ID."""
-        with self._get_session() as session:
-            download = session.get(Download, job_id)
+        async with self._get_session() as session:
+            download = await session.get(Download, job_id)
             if download:
                 return download.to_pydantic()
         return None
 
-    def update_job(
+    async def update_job(
         self,
         job_id: str,
         status: Optional[DownloadStatus] = None,
@@ -106,55 +174,63 @@ class DownloadQueueManager:
         output_path: Optional[str] = None,
     ):
         """Update a job's status/progress."""
-        with self._get_session() as session:
-            download = session.get(Download, job_id)
-            if not download:
-                return
+        values = {}
+
+        if status is not None:
+            values["status"] = status.value
+            if status == DownloadStatus.DOWNLOADING:
+                values["started_at"] = datetime.now()
+            elif status in (DownloadStatus.COMPLETED, DownloadStatus.FAILED):
+                values["completed_at"] = datetime.now()
 
-            if status is not None:
-                download.status = status.value
-                if status == DownloadStatus.DOWNLOADING:
-                    download.started_at = datetime.now()
-                elif status in (DownloadStatus.COMPLETED, DownloadStatus.FAILED):
-                    download.completed_at = datetime.now()
+        if progress is not None:
+            values["progress"] = progress
 
-            if progress is not None:
-                download.progress = progress
+        if error is not None:
+            values["error"] = error
 
-            if error is not None:
-                download.error = error
+        if output_path is not None:
+            values["output_path"] = output_path
+
+        if not values:
+            return
 
-            if output_path is not None:
-                download.output_path = output_path
+        async with self._get_session() as session:
+            await session.execute(
+                update(Download).where(Download.id == job_id).values(**values)
+            )
+            await session.commit()
 
-            session.commit()
+        self._invalidate()
 
-    def delete_job(self, job_id: str) -> bool:
+    async def delete_job(self, job_id: str) -> bool:
         """Delete a job by ID."""
-        with self._get_session() as session:
-            download = session.get(Download, job_id)
+        async with self._get_session() as session:
+            download = await session.get(Download, job_id)
             if download:
-                session.delete(download)
-                session.commit()
+                await session.delete(download)
+                await session.commit()
+                self._invalidate()
                 return True
         return False
 
-    def get_queue(self) -> DownloadQueueResponse:
+    async def get_queue(self) -> DownloadQueueResponse:
         """Get the current download queue."""
-        with self._get_session() as session:
+        key = ("queue",)
+        cached = self._cached(key)
+        if cached is not None:
+            return cached
+
+        epoch = self._epoch
+        async with self._get_session() as session:
             # Get active job
             active_stmt = (
                 select(Download)
-                .where(
-                    or_(
-                        Download.status == DownloadStatus.DOWNLOADING.value,
-                        Download.status == DownloadStatus.ANALYZING.value,
-                    )
-                )
+                .where(_ACTIVE_STATUSES)
                 .order_by(Download.started_at.desc())
                 .limit(1)
             )
-            active_download = session.scalar(active_stmt)
+            active_download = await session.scalar(active_stmt)
 
             # Get pending jobs
             pending_stmt = (
@@ -162,62 +238,69 @@ class DownloadQueueManager:
                 .where(Download.status == DownloadStatus.PENDING.value)
                 .order_by(Download.created_at.asc())
             )
-            pending_downloads = session.scalars(pending_stmt).all()
+            pending_downloads = (await session.scalars(pending_stmt)).all()
 
-            return DownloadQueueResponse(
+            response = DownloadQueueResponse(
                 active=active_download.to_pydantic() if active_download else None,
                 pending=[d.to_pydantic() for d in pending_downloads],
             )
 
-    def get_history(
+        self._cache[key] = (epoch, response)
+        return response
+
+    async def get_history(
         self, limit: int = 50, offset: int = 0
     ) -> DownloadHistoryResponse:
         """Get download history (completed/failed jobs)."""
-        with self._get_session() as session:
+        key = ("history", limit, offset)
+        cached = self._cached(key)
+        if cached is not None:
+            return cached
+
+        epoch = self._epoch
+        async with self._get_session() as session:
             # Get total count
-            count_stmt = select(Download).where(
-                or_(
-                    Download.status == DownloadStatus.COMPLETED.value,
-                    Download.status == DownloadStatus.FAILED.value,
-                    Download.status == DownloadStatus.CANCELLED.value,
-                )
+            count_stmt = (
+                select(func.count()).select_from(Download).where(_HISTORY_STATUSES)
             )
-            total = len(session.scalars(count_stmt).all())
+            total = await session.scalar(count_stmt)
 
             # Get paginated results
             stmt = (
                 select(Download)
-                .where(
-                    or_(
-                        Download.status == DownloadStatus.COMPLETED.value,
-                        Download.status == DownloadStatus.FAILED.value,
-                        Download.status == DownloadStatus.CANCELLED.value,
-                    )
-                )
+                .where(_HISTORY_STATUSES)
                 .order_by(Download.completed_at.desc())
                 .offset(offset)
                 .limit(limit)
             )
-            downloads = session.scalars(stmt).all()
+            downloads = (await session.scalars(stmt)).all()
 
-            return DownloadHistoryResponse(
+            response = DownloadHistoryResponse(
                 downloads=[d.to_pydantic() for d in downloads],
                 total=total,
             )
 
-    def get_next_pending(self) -> Optional[DownloadJob]:
-        """Get the next pending job from the queue."""
-        with self._get_session() as session:
+        self._cache[key] = (epoch, response)
+        return response
+
+    async def get_next_pending(self) -> Optional[str]:
+        """Get the ID of the next pending job in the queue."""
+        async with self._get_session() as session:
             stmt = (
-                select(Download)
+                select(Download.id)
                 .where(Download.status == DownloadStatus.PENDING.value)
                 .order_by(Download.created_at.asc())
                 .limit(1)
             )
-            download = session.scalar(stmt)
-            if download:
-                return download.to_pydantic()
-        return None
+            return await session.scalar(stmt)
+
+    async def process_job_by_id(self, job_id: str):
+        """Load a pending job and process it."""
+        job = await self.get_job(job_id)
+        # It may have been cancelled or removed since it was picked
+        if job is None or job.status != DownloadStatus.PENDING:
+            return
+        await self.process_job(job)
 
     async def process_job(self, job: DownloadJob):
         """Process a single download job."""
@@ -225,19 +308,43 @@ class DownloadQueueManager:
         logger.info(f"Starting download: {job.id} - {job.url}")
 
         try:
-            self.update_job(job.id, status=DownloadStatus.DOWNLOADING)
+            await self.update_job(job.id, status=DownloadStatus.DOWNLOADING)
 
-            def progress_callback(progress: float, status: str):
-                self.update_job(job.id, progress=progress)
+            # yt-dlp reports progress through a plain callback, so schedule
+            # the writes and wait for them before the final status update.
+            progress_writes: set[asyncio.Task] = set()
+            last_write = 0.0
+            last_progress = -1.0
 
-            output_path = await ytdlp_service.download(
-                url=job.url,
-                media_type=job.media_type,
-                metadata=job.metadata,
-                progress_callback=progress_callback,
-            )
+            def progress_callback(progress: float, status: str):
+                nonlocal last_write, last_progress
+                # yt-dlp emits many ticks per second; only persist when enough
+                # time has passed or progress moved noticeably
+                now = time.monotonic()
+                if (
+                    now - last_write < _PROGRESS_WRITE_INTERVAL
+                    and abs(progress - last_progress) < _PROGRESS_WRITE_MIN_DELTA
+                ):
+                    return
+                last_write = now
+                last_progress = progress
+
+                task = asyncio.create_task(self.update_job(job.id, progress=progress))
+                progress_writes.add(task)
+                task.add_done_callback(progress_writes.discard)
+
+            try:
+                output_path = await ytdlp_service.download(
+                    url=job.url,
+                    media_type=job.media_type,
+                    metadata=job.metadata,
+                    progress_callback=progress_callback,
+                )
+            finally:
+                if progress_writes:
+                    await asyncio.gather(*progress_writes, return_exceptions=True)
 
-            self.update_job(
+            await self.update_job(
                 job.id,
                 status=DownloadStatus.COMPLETED,
                 progress=100.0,
@@ -256,7 +363,7 @@ class DownloadQueueManager:
 
         except Exception as e:
             logger.error(f"Download failed: {job.id} - {e}")
-            self.update_job(
+            await self.update_job(
                 job.id,
                 status=DownloadStatus.FAILED,
                 error=str(e),
@@ -285,11 +392,19 @@ class DownloadQueueManager:
 
         try:
             while self._processing:
-                job = self.get_next_pending()
-                if job:
-                    await self.process_job(job)
+                # Clear before looking so a job queued during the lookup
+                # still wakes the next wait
+                self._wakeup.clear()
+                job_id = await self.get_next_pending()
+                if job_id:
+                    await self.process_job_by_id(job_id)
                 else:
-                    await asyncio.sleep(2)
+                    try:
+                        await asyncio.wait_for(
+                            self._wakeup.wait(), timeout=_WORKER_IDLE_TIMEOUT
+                        )
+                    except asyncio.TimeoutError:
+                        pass
         except asyncio.CancelledError:
             logger.info("Download worker cancelled")
         finally:
@@ -298,17 +413,18 @@ class DownloadQueueManager:
     def stop_worker(self):
         """Stop the background worker."""
         self._processing = False
+        self._wakeup.set()
 
-    def cancel_job(self, job_id: str) -> bool:
+    async def cancel_job(self, job_id: str) -> bool:
         """Cancel a pending or active job."""
-        job = self.get_job(job_id)
+        job = await self.get_job(job_id)
         if not job:
             return False
 
         if job.status in (DownloadStatus.COMPLETED, DownloadStatus.CANCELLED):
             return False
 
-        self.update_job(job_id, status=DownloadStatus.CANCELLED)
+        await self.update_job(job_id, status=DownloadStatus.CANCELLED)
         return True
 
 
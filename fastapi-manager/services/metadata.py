@@ -1,55 +1,86 @@
 """Shared metadata detection utilities."""
 
-import hashlib
+import asyncio
+import logging
+import os
 import time
+from collections import OrderedDict
+from collections.abc import Iterator
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
 import guessit
-import tmdbsimple as tmdb
+import httpx
 from mutagen import File as MutagenFile
 from mutagen.easyid3 import EasyID3
 from mutagen.flac import FLAC
 
 from config import settings
 
-# Configure TMDB API
-if settings.TMDB_API_KEY:
-    tmdb.API_KEY = settings.TMDB_API_KEY
+logger = logging.getLogger(__name__)
 
-# Simple in-memory cache for TMDB results
-_tmdb_cache: dict[str, tuple[float, Any]] = {}
+TMDB_API_URL = "https://api.themoviedb.org/3"
+
+# Shared TMDB client so lookups reuse pooled connections
+_tmdb_client: httpx.AsyncClient | None = None
+
+# Bounded in-memory LRU cache for TMDB results, keyed by (title, year, media_type)
+_tmdb_cache: OrderedDict[tuple, tuple[float, Any]] = OrderedDict()
 CACHE_TTL = 3600  # 1 hour
+CACHE_MAX_ENTRIES = 1024
+
+# Lookups currently in flight, so concurrent analyses of one title share a request
+_tmdb_inflight: dict[tuple, asyncio.Future] = {}
+
+# Cap concurrent TMDB requests to stay inside the API rate limit
+TMDB_MAX_CONCURRENT_REQUESTS = 5
+_tmdb_semaphore = asyncio.Semaphore(TMDB_MAX_CONCURRENT_REQUESTS)
 
 # Video file extensions
 VIDEO_EXTENSIONS = {'.mkv', '.mp4', '.avi', '.mov', '.wmv', '.flv', '.webm', '.m4v', '.ts', '.m2ts'}
 # Audio file extensions
 AUDIO_EXTENSIONS = {'.mp3', '.flac', '.m4a', '.aac', '.ogg', '.opus', '.wav', '.wma', '.alac'}
 
+# Max audio files read with mutagen at once while analyzing a folder
+AUDIO_METADATA_CONCURRENCY = 8
 
-def _get_cache_key(title: str, year: int | None, media_type: str) -> str:
-    """Generate cache key for TMDB lookups."""
-    return hashlib.md5(f"{title}:{year}:{media_type}".encode()).hexdigest()
+# guessit fields that mark a folder name as a video release
+VIDEO_RELEASE_HINTS = ('season', 'episode', 'screen_size', 'source', 'video_codec')
 
 
-def _get_from_cache(key: str) -> Any | None:
+def _get_from_cache(key: tuple) -> Any | None:
     """Get value from cache if not expired."""
-    if key in _tmdb_cache:
-        timestamp, value = _tmdb_cache[key]
-        if time.time() - timestamp < CACHE_TTL:
-            return value
+    entry = _tmdb_cache.get(key)
+    if entry is None:
+        return None
+    timestamp, value = entry
+    if time.monotonic() - timestamp >= CACHE_TTL:
         del _tmdb_cache[key]
-    return None
+        return None
+    _tmdb_cache.move_to_end(key)
+    return value
+
+
+def _set_cache(key: tuple, value: Any) -> None:
+    """Set value in cache, evicting the least recently used entries."""
+    _tmdb_cache[key] = (time.monotonic(), value)
+    _tmdb_cache.move_to_end(key)
+    while len(_tmdb_cache) > CACHE_MAX_ENTRIES:
+        _tmdb_cache.popitem(last=False)
 
 
-def _set_cache(key: str, value: Any) -> None:
-    """Set value in cache."""
-    _tmdb_cache[key] = (time.time(), value)
+def _ext(name: str) -> str:
+    """Get the lowercase extension of a bare file name (same rules as Path.suffix)."""
+    i = name.rfind('.')
+    if 0 < i < len(name) - 1:
+        return name[i:].lower()
+    return ''
 
 
 def get_file_extension(file_path: str) -> str:
     """Get lowercase file extension."""
-    return Path(file_path).suffix.lower()
+    return _ext(os.path.basename(file_path.rstrip(os.sep)))
 
 
 def is_video_file(file_path: str) -> bool:
@@ -62,11 +93,48 @@ def is_audio_file(file_path: str) -> bool:
     return get_file_extension(file_path) in AUDIO_EXTENSIONS
 
 
-def detect_media_type(file_path: str) -> str:
+def _walk_files(root: str | Path) -> Iterator[tuple[str, str, str]]:
+    """Recursively yield (path, name, lowercase extension) for files under root.
+
+    Uses os.scandir so file checks come from the directory entry instead of
+    an extra stat() per file.
+    """
+    stack = [str(root)]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file():
+                        yield entry.path, entry.name, _ext(entry.name)
+        except OSError:
+            continue
+
+
+def _scan_dir(root: str | Path) -> tuple[list[tuple[str, str]], list[tuple[str, str]]]:
+    """Collect (path, name) pairs for audio and video files in one walk.
+
+    Returns:
+        (audio_files, video_files)
+    """
+    audio_files = []
+    video_files = []
+    for file_path, name, ext in _walk_files(root):
+        if ext in VIDEO_EXTENSIONS:
+            video_files.append((file_path, name))
+        elif ext in AUDIO_EXTENSIONS:
+            audio_files.append((file_path, name))
+    return audio_files, video_files
+
+
+def detect_media_type(file_path: str, _scan: tuple | None = None) -> str:
     """Detect if file is a movie, TV show, or music.
 
     Args:
         file_path: Path to media file
+        _scan: Result of _scan_dir() for a directory, if already computed
 
     Returns:
         Media type: 'movie', 'tv', 'music', or 'unknown'
@@ -76,14 +144,10 @@ def detect_media_type(file_path: str) -> str:
     # Check if it's a directory (could be a season pack or album)
     if path.is_dir():
         # Look at files inside
-        video_count = 0
-        audio_count = 0
-        for item in path.rglob('*'):
-            if item.is_file():
-                if is_video_file(str(item)):
-                    video_count += 1
-                elif is_audio_file(str(item)):
-                    audio_count += 1
+        if _scan is None:
+            _scan = _scan_dir(path)
+        audio_count = len(_scan[0])
+        video_count = len(_scan[1])
 
         if audio_count > video_count and audio_count > 0:
             return 'music'
@@ -109,6 +173,17 @@ def detect_media_type(file_path: str) -> str:
     return 'unknown'
 
 
+@lru_cache(maxsize=4096)
+def _guessit_cached(filename: str) -> dict:
+    """Run guessit once per distinct filename (it is pure but slow)."""
+    try:
+        result = guessit.guessit(filename)
+        # Convert MatchesDict to regular dict
+        return dict(result)
+    except Exception:
+        return {'title': Path(filename).stem, 'type': 'unknown'}
+
+
 def parse_filename(filename: str) -> dict:
     """Parse media filename to extract metadata.
 
@@ -118,12 +193,8 @@ def parse_filename(filename: str) -> dict:
     Returns:
         Parsed metadata (title, year, season, episode, etc.)
     """
-    try:
-        result = guessit.guessit(filename)
-        # Convert MatchesDict to regular dict
-        return dict(result)
-    except Exception:
-        return {'title': Path(filename).stem, 'type': 'unknown'}
+    # Copy so callers can't modify the cached result
+    return dict(_guessit_cached(filename))
 
 
 def calculate_confidence(parsed: dict, media_type: str) -> str:
@@ -177,57 +248,96 @@ async def lookup_tmdb(title: str, year: int | None = None, media_type: str = "mo
     if not settings.TMDB_API_KEY:
         return []
 
-    # Check cache
-    cache_key = _get_cache_key(title, year, media_type)
+    # Check cache (titles differing only in case share an entry)
+    cache_key = (title.casefold(), year, media_type)
     cached = _get_from_cache(cache_key)
     if cached is not None:
         return cached
 
-    try:
-        search = tmdb.Search()
-        results = []
+    # Join an identical lookup that is already running
+    future = _tmdb_inflight.get(cache_key)
+    if future is None:
+        future = asyncio.ensure_future(_search_tmdb(cache_key, title, year, media_type))
+        _tmdb_inflight[cache_key] = future
+        future.add_done_callback(lambda _: _tmdb_inflight.pop(cache_key, None))
+    return await asyncio.shield(future)
 
-        if media_type == 'tv':
-            if year:
-                response = search.tv(query=title, first_air_date_year=year)
-            else:
-                response = search.tv(query=title)
-
-            for item in response.get('results', [])[:5]:
-                results.append({
-                    'tmdb_id': item['id'],
-                    'title': item['name'],
-                    'original_title': item.get('original_name'),
-                    'year': item.get('first_air_date', '')[:4] if item.get('first_air_date') else None,
-                    'overview': item.get('overview', ''),
-                    'poster_path': f"https://image.tmdb.org/t/p/w200{item['poster_path']}" if item.get('poster_path') else None,
-                    'vote_average': item.get('vote_average', 0),
-                    'media_type': 'tv'
-                })
-        else:
-            if year:
-                response = search.movie(query=title, year=year)
-            else:
-                response = search.movie(query=title)
-
-            for item in response.get('results', [])[:5]:
-                results.append({
-                    'tmdb_id': item['id'],
-                    'title': item['title'],
-                    'original_title': item.get('original_title'),
-                    'year': item.get('release_date', '')[:4] if item.get('release_date') else None,
-                    'overview': item.get('overview', ''),
-                    'poster_path': f"https://image.tmdb.org/t/p/w200{item['poster_path']}" if item.get('poster_path') else None,
-                    'vote_average': item.get('vote_average', 0),
-                    'media_type': 'movie'
-                })
+
+def _get_tmdb_client() -> httpx.AsyncClient:
+    """Get the shared TMDB HTTP client, creating it on first use."""
+    global _tmdb_client
+    if _tmdb_client is None or _tmdb_client.is_closed:
+        _tmdb_client = httpx.AsyncClient(
+            base_url=TMDB_API_URL,
+            params={'api_key': settings.TMDB_API_KEY},
+            timeout=10,
+        )
+    return _tmdb_client
+
+
+async def _do_search(title: str, year: int | None, media_type: str) -> list[dict]:
+    """Query the TMDB search API for a movie or TV show."""
+    client = _get_tmdb_client()
+    results = []
+
+    if media_type == 'tv':
+        params = {'query': title}
+        if year:
+            params['first_air_date_year'] = year
+        resp = await client.get('/search/tv', params=params)
+        resp.raise_for_status()
+        response = resp.json()
+
+        for item in response.get('results', [])[:5]:
+            results.append({
+                'tmdb_id': item['id'],
+                'title': item['name'],
+                'original_title': item.get('original_name'),
+                'year': item.get('first_air_date', '')[:4] if item.get('first_air_date') else None,
+                'overview': item.get('overview', ''),
+                'poster_path': f"https://image.tmdb.org/t/p/w200{item['poster_path']}" if item.get('poster_path') else None,
+                'vote_average': item.get('vote_average', 0),
+                'media_type': 'tv'
+            })
+    else:
+        params = {'query': title}
+        if year:
+            params['year'] = year
+        resp = await client.get('/search/movie', params=params)
+        resp.raise_for_status()
+        response = resp.json()
+
+        for item in response.get('results', [])[:5]:
+            results.append({
+                'tmdb_id': item['id'],
+                'title': item['title'],
+                'original_title': item.get('original_title'),
+                'year': item.get('release_date', '')[:4] if item.get('release_date') else None,
+                'overview': item.get('overview', ''),
+                'poster_path': f"https://image.tmdb.org/t/p/w200{item['poster_path']}" if item.get('poster_path') else None,
+                'vote_average': item.get('vote_average', 0),
+                'media_type': 'movie'
+            })
+
+    return results
+
+
+async def _search_tmdb(cache_key: tuple, title: str, year: int | None, media_type: str) -> list[dict]:
+    """Run a TMDB search and cache successful results."""
+    try:
+        async with _tmdb_semaphore:
+            results = await _do_search(title, year, media_type)
 
         # Cache results
         _set_cache(cache_key, results)
         return results
 
+    except httpx.HTTPStatusError as e:
+        # The request URL carries the API key, so don't log the full error
+        logger.warning(f"TMDB lookup failed for '{title}': HTTP {e.response.status_code}")
+        return []
     except Exception as e:
-        print(f"TMDB lookup error: {e}")
+        logger.warning(f"TMDB lookup failed for '{title}': {e}")
         return []
 
 
@@ -281,16 +391,30 @@ def extract_audio_metadata(file_path: str) -> dict:
                 metadata['genre'] = audio['genre'][0] if audio['genre'] else None
 
     except Exception as e:
-        print(f"Error extracting audio metadata: {e}")
+        logger.warning(f"Error extracting audio metadata from {file_path}: {e}")
 
     return metadata
 
 
-async def analyze_item(path: str) -> dict:
+async def _extract_audio_metadata_many(paths: list[str]) -> list[dict]:
+    """Extract audio metadata for many files concurrently in worker threads."""
+    semaphore = asyncio.Semaphore(AUDIO_METADATA_CONCURRENCY)
+
+    async def extract(file_path: str) -> dict:
+        async with semaphore:
+            return await asyncio.to_thread(extract_audio_metadata, file_path)
+
+    return await asyncio.gather(*(extract(p) for p in paths))
+
+
+async def analyze_item(path: str, detail: bool = False) -> dict:
     """Analyze a file or folder and return detected metadata.
 
     Args:
         path: Path to file or folder to analyze
+        detail: Read tags for every file in a music folder (otherwise files
+            are listed without metadata and tags are read only until the
+            album is identified)
 
     Returns:
         Analysis result with media_type, metadata, confidence, and tmdb_matches
@@ -311,34 +435,65 @@ async def analyze_item(path: str) -> dict:
         'files': []
     }
 
+    # Walk a folder once; type detection and file listing share the result
+    scan = None
+    if result['is_directory']:
+        async with asyncio.TaskGroup() as tg:
+            scan_task = tg.create_task(asyncio.to_thread(_scan_dir, item_path))
+
+            # A folder named like a video release will almost certainly need
+            # its TMDB lookup, so start it while the folder is being walked.
+            # The later lookup for the same title is served from the cache.
+            folder_parsed = parse_filename(item_path.name)
+            if folder_parsed.get('title') and any(
+                folder_parsed.get(hint) is not None for hint in VIDEO_RELEASE_HINTS
+            ):
+                tg.create_task(lookup_tmdb(
+                    folder_parsed['title'],
+                    folder_parsed.get('year'),
+                    'tv' if folder_parsed.get('type') == 'episode' else 'movie'
+                ))
+        scan = scan_task.result()
+
     # Detect media type
-    media_type = detect_media_type(path)
+    media_type = detect_media_type(path, _scan=scan)
     result['media_type'] = media_type
 
     if media_type == 'music':
         # Handle music files/folders
-        if item_path.is_dir():
-            # Scan directory for audio files
-            audio_files = []
-            for f in item_path.rglob('*'):
-                if f.is_file() and is_audio_file(str(f)):
-                    audio_meta = extract_audio_metadata(str(f))
-                    audio_files.append({
-                        'path': str(f),
-                        'name': f.name,
-                        'metadata': audio_meta
-                    })
-            result['files'] = audio_files
+        if scan is not None:
+            # Audio files found by the directory scan
+            audio_entries = scan[0]
+
+            if detail:
+                # Read every file's tags so the caller can show them
+                audio_metas = await _extract_audio_metadata_many(
+                    [file_path for file_path, _ in audio_entries]
+                )
+            else:
+                audio_metas = [None] * len(audio_entries)
+
+            result['files'] = [
+                {
+                    'path': file_path,
+                    'name': name,
+                    'metadata': audio_meta
+                }
+                for (file_path, name), audio_meta in zip(audio_entries, audio_metas)
+            ]
 
             # Try to determine album metadata from files
-            if audio_files:
-                # Use first file with metadata as reference
-                for af in audio_files:
-                    if af['metadata'].get('artist') and af['metadata'].get('album'):
+            if audio_entries:
+                # Use first file with metadata as reference, reading tags
+                # one file at a time unless they were all read above
+                for (file_path, _), audio_meta in zip(audio_entries, audio_metas):
+                    if audio_meta is None:
+                        audio_meta = await asyncio.to_thread(extract_audio_metadata, file_path)
+                    if audio_meta.get('artist') and audio_meta.get('album'):
                         result['metadata'] = {
-                            'artist': af['metadata']['artist'],
-                            'album': af['metadata']['album'],
-                            'year': af['metadata'].get('year')
+                            'artist': audio_meta['artist'],
+                            'album': audio_meta['album'],
+                            'year': audio_meta.get('year')
                         }
                         break
 
@@ -358,17 +513,16 @@ async def analyze_item(path: str) -> dict:
         # Handle video files/folders
         name_to_parse = item_path.name
 
-        if item_path.is_dir():
+        if scan is not None:
             # Find video files in directory
             video_files = []
-            for f in item_path.rglob('*'):
-                if f.is_file() and is_video_file(str(f)):
-                    parsed = parse_filename(f.name)
-                    video_files.append({
-                        'path': str(f),
-                        'name': f.name,
-                        'metadata': parsed
-                    })
+            for file_path, name in scan[1]:
+                parsed = parse_filename(name)
+                video_files.append({
+                    'path': file_path,
+                    'name': name,
+                    'metadata': parsed
+                })
             result['files'] = sorted(video_files, key=lambda x: x['name'])
 
             # Check if it's a season pack
@@ -397,13 +551,24 @@ async def analyze_item(path: str) -> dict:
         # Calculate confidence
         result['confidence'] = calculate_confidence(parsed, media_type)
 
-        # Look up on TMDB if we have a title
+        # Look up on TMDB if we have a title. Files in a folder can carry
+        # other titles than the folder itself; look those up in parallel.
         if parsed.get('title'):
             tmdb_type = 'tv' if media_type == 'tv' else 'movie'
-            result['tmdb_matches'] = await lookup_tmdb(
-                parsed['title'],
-                parsed.get('year'),
-                tmdb_type
-            )
+            queries = {(parsed['title'], parsed.get('year')): None}
+            for vf in result['files']:
+                file_title = vf['metadata'].get('title')
+                if file_title:
+                    queries.setdefault((file_title, vf['metadata'].get('year')), None)
+
+            lookups = await asyncio.gather(*(
+                lookup_tmdb(title, year, tmdb_type) for title, year in queries
+            ))
+
+            seen_ids = set()
+            for match in (m for matches in lookups for m in matches):
+                if match['tmdb_id'] not in seen_ids:
+                    seen_ids.add(match['tmdb_id'])
+                    result['tmdb_matches'].append(match)
 
     return result
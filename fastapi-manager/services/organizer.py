@@ -1,27 +1,58 @@
 """Torrent organizer service for sorting downloaded media."""
 
+import asyncio
+import errno
 import logging
 import os
+import re
 import shutil
+import stat
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from operator import attrgetter
 from pathlib import Path
-from typing import Literal
+from typing import Literal, NamedTuple
 
 from config import settings
-from services.metadata import is_video_file, is_audio_file, VIDEO_EXTENSIONS, AUDIO_EXTENSIONS
+from services.metadata import parse_filename, VIDEO_EXTENSIONS, AUDIO_EXTENSIONS
 
 logger = logging.getLogger(__name__)
 
+# Characters not allowed in file/folder names, and runs of spaces to collapse
+_INVALID_CHARS = str.maketrans('', '', '<>:"/\\|?*')
+_MULTI_SPACE = re.compile(r' {2,}')
 
-def get_jellyfin_library_paths() -> dict[str, Path]:
+# Lowercase media extensions, checked inline against file suffixes
+_VIDEO_EXT = frozenset(e.lower() for e in VIDEO_EXTENSIONS)
+_AUDIO_EXT = frozenset(e.lower() for e in AUDIO_EXTENSIONS)
+
+# Units for format_size, in steps of 1024
+_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB', 'PB')
+
+# Max files moved at once when moving a folder
+MAX_MOVE_WORKERS = 8
+
+
+class LibraryPaths(NamedTuple):
+    """Jellyfin library root folders."""
+    movie: Path
+    tv: Path
+    music: Path
+
+
+@lru_cache(maxsize=1)
+def get_jellyfin_library_paths() -> LibraryPaths:
     """Get Jellyfin library paths for different media types."""
     media_base = Path(settings.MEDIA_BASE)
-    return {
-        'movie': media_base / 'Movies',
-        'tv': media_base / 'Shows',
-        'music': media_base / 'Music'
-    }
+    return LibraryPaths(
+        movie=media_base / 'Movies',
+        tv=media_base / 'Shows',
+        music=media_base / 'Music'
+    )
 
 
+@lru_cache(maxsize=4096)
 def sanitize_filename(name: str) -> str:
     """Sanitize a string for use as a filename/folder name.
 
@@ -31,16 +62,12 @@ def sanitize_filename(name: str) -> str:
     Returns:
         Sanitized name safe for filesystem use
     """
-    # Remove or replace invalid characters
-    invalid_chars = '<>:"/\\|?*'
-    for char in invalid_chars:
-        name = name.replace(char, '')
+    # Remove invalid characters
+    name = name.translate(_INVALID_CHARS)
     # Remove leading/trailing whitespace and periods
     name = name.strip().strip('.')
     # Replace multiple spaces with single space
-    while '  ' in name:
-        name = name.replace('  ', ' ')
-    return name
+    return _MULTI_SPACE.sub(' ', name)
 
 
 def generate_movie_path(title: str, year: int | None = None) -> Path:
@@ -57,7 +84,7 @@ def generate_movie_path(title: str, year: int | None = None) -> Path:
     folder_name = sanitize_filename(title)
     if year:
         folder_name = f"{folder_name} ({year})"
-    return libraries['movie'] / folder_name
+    return libraries.movie / folder_name
 
 
 def generate_tv_path(title: str, season: int | None = None) -> Path:
@@ -72,7 +99,7 @@ def generate_tv_path(title: str, season: int | None = None) -> Path:
     """
     libraries = get_jellyfin_library_paths()
     show_folder = sanitize_filename(title)
-    base_path = libraries['tv'] / show_folder
+    base_path = libraries.tv / show_folder
     if season is not None:
         return base_path / f"Season {season:02d}"
     return base_path
@@ -90,7 +117,11 @@ def generate_tv_filename(title: str, season: int, episode: int, extension: str)
     Returns:
         Formatted filename
     """
-    clean_title = sanitize_filename(title)
+    return _format_tv_filename(sanitize_filename(title), season, episode, extension)
+
+
+def _format_tv_filename(clean_title: str, season: int, episode: int, extension: str) -> str:
+    """Format a TV episode filename from an already sanitized show title."""
     return f"{clean_title} - S{season:02d}E{episode:02d}{extension}"
 
 
@@ -106,22 +137,52 @@ def generate_music_path(artist: str, album: str | None = None) -> Path:
     """
     libraries = get_jellyfin_library_paths()
     artist_folder = sanitize_filename(artist) if artist else "Unknown Artist"
-    base_path = libraries['music'] / artist_folder
+    base_path = libraries.music / artist_folder
     if album:
         return base_path / sanitize_filename(album)
     return base_path
 
 
-def resolve_conflict(dest_path: Path) -> Path:
+def _find_free_suffix(candidate, taken) -> Path:
+    """Find a free numbered path with O(log n) existence checks.
+
+    candidate(n) builds the path for suffix number n and taken(path) says
+    whether it is in use. Probes 1, 2, 4, 8...
+    until a free one is found, then binary searches below it. With a
+    contiguous run of taken numbers (the usual case) this finds the lowest
+    free number; with gaps it still always returns a free path.
+    """
+    lo, hi = 1, 1
+    while taken(candidate(hi)):
+        lo, hi = hi + 1, hi * 2
+
+    # Invariant: candidate(hi) is free, everything below lo is taken
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if taken(candidate(mid)):
+            lo = mid + 1
+        else:
+            hi = mid
+    return candidate(hi)
+
+
+def resolve_conflict(dest_path: Path, reserved: set[Path] | None = None) -> Path:
     """Resolve naming conflicts by appending a number.
 
     Args:
         dest_path: Original destination path
+        reserved: Paths already claimed by moves that haven't run yet
 
     Returns:
         Available path (original or with number suffix)
     """
-    if not dest_path.exists():
+    if reserved:
+        def taken(path: Path) -> bool:
+            return path in reserved or path.exists()
+    else:
+        taken = Path.exists
+
+    if not taken(dest_path):
         return dest_path
 
     logger.warning(f"Destination already exists, resolving conflict: {dest_path}")
@@ -131,66 +192,95 @@ def resolve_conflict(dest_path: Path) -> Path:
         base = dest_path.stem
         ext = dest_path.suffix
         parent = dest_path.parent
-        counter = 1
-        while True:
-            new_path = parent / f"{base} ({counter}){ext}"
-            if not new_path.exists():
-                logger.info(f"Resolved conflict by renaming to: {new_path}")
-                return new_path
-            counter += 1
-
-    # For directories, append number
-    counter = 1
-    while True:
-        new_path = Path(f"{dest_path} ({counter})")
-        if not new_path.exists():
-            logger.info(f"Resolved conflict by renaming to: {new_path}")
-            return new_path
-        counter += 1
-
-
-def _has_matching_folder(file_stem: str, all_items: list[Path]) -> bool:
-    """Check if a file stem matches or significantly overlaps with any folder name."""
-    MIN_NAME_LENGTH = 5
-    OVERLAP_THRESHOLD = 0.8
 
+        def candidate(n: int) -> Path:
+            return parent / f"{base} ({n}){ext}"
+    else:
+        # For directories, append number
+        def candidate(n: int) -> Path:
+            return Path(f"{dest_path} ({n})")
+
+    # Every candidate lives next to dest_path, so list that folder once and
+    # probe names in memory instead of stat()ing each one
+    try:
+        with os.scandir(dest_path.parent) as entries:
+            existing = {entry.name for entry in entries}
+    except OSError:
+        existing = None
+
+    new_path = None
+    if existing is not None:
+        new_path = _find_free_suffix(
+            candidate,
+            lambda path: path.name in existing or (reserved is not None and path in reserved),
+        )
+        # Names can still clash on case-insensitive filesystems
+        if new_path.exists():
+            new_path = None
+    if new_path is None:
+        new_path = _find_free_suffix(candidate, taken)
+
+    logger.info(f"Resolved conflict by renaming to: {new_path}")
+    return new_path
+
+
+# Folder/file names shorter than this never match by prefix, only exactly
+MIN_NAME_LENGTH = 5
+
+
+def build_folder_index(all_items: list[os.DirEntry | Path]) -> dict[str, list[str]]:
+    """Index the lowercase names of the folders among all_items.
+
+    Names are bucketed by their first MIN_NAME_LENGTH characters. Any folder
+    that can match a file stem shares that prefix with it, so
+    _has_matching_folder only has to compare against a single bucket.
+    """
+    folder_index: dict[str, list[str]] = {}
     for item in all_items:
-        if not item.is_dir():
-            continue
+        if item.is_dir():
+            name = item.name.lower()
+            folder_index.setdefault(name[:MIN_NAME_LENGTH], []).append(name)
+    return folder_index
 
-        folder_name = item.name.lower()
 
+def _has_matching_folder(file_stem: str, folder_index: dict[str, list[str]]) -> bool:
+    """Check if a file stem matches or significantly overlaps with any folder name."""
+    for folder_name in folder_index.get(file_stem[:MIN_NAME_LENGTH], ()):
         if file_stem == folder_name:
             return True
 
-        if file_stem.startswith(folder_name) or folder_name.startswith(file_stem):
-            min_len = min(len(file_stem), len(folder_name))
-            if min_len > MIN_NAME_LENGTH:
-                common_prefix_len = len(os.path.commonprefix([file_stem, folder_name]))
-                if common_prefix_len >= min_len * OVERLAP_THRESHOLD:
-                    return True
+        # When one name is a prefix of the other, their common prefix is the
+        # whole shorter name, so only its length needs checking
+        if min(len(file_stem), len(folder_name)) > MIN_NAME_LENGTH and (
+            file_stem.startswith(folder_name) or folder_name.startswith(file_stem)
+        ):
+            return True
 
     return False
 
 
-def is_companion_file(file_path: Path, all_items: list[Path], max_size_mb: float = 5.0) -> bool:
+def is_companion_file(
+    file_path: os.DirEntry | Path,
+    folder_index: dict[str, list[str]],
+    max_size_mb: float = 5.0
+) -> bool:
     """Check if a file is a small companion file that should be hidden.
 
     Companion files are small files (< max_size_mb) that share a name stem with
     a folder in the same directory. These are typically torrent metadata files
     (.nfo, .txt), magnet links, or sample files that clutter the organize view.
 
+    Callers are expected to skip directories before calling this.
+
     Args:
-        file_path: Path to the file to check
-        all_items: List of all items in the directory
+        file_path: Path or os.DirEntry of the file to check (a DirEntry
+            reuses its cached type and stat results)
+        folder_index: Folder names in the directory, from build_folder_index()
         max_size_mb: Maximum size in MB to consider as a companion file
 
     Returns:
         True if the file should be hidden as a companion file
     """
-    if not file_path.is_file():
-        return False
-
     try:
         size_bytes = file_path.stat().st_size
         max_size_bytes = max_size_mb * 1024 * 1024
@@ -199,66 +289,164 @@ def is_companion_file(file_path: Path, all_items: list[Path], max_size_mb: float
     except OSError:
         return False
 
-    file_stem = file_path.stem.lower()
-    return _has_matching_folder(file_stem, all_items)
+    file_stem = Path(file_path.name).stem.lower()
+    return _has_matching_folder(file_stem, folder_index)
+
+
+def _walk_files(root: str | Path) -> Iterator[os.DirEntry]:
+    """Recursively yield a DirEntry for every file under root."""
+    stack = [str(root)]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file():
+                    yield entry
+
+
+def _dir_size(path: str) -> int:
+    """Total size in bytes of all files under a directory.
+
+    Walks with os.scandir so entry types and sizes come from the directory
+    listing instead of separate stat() calls per file.
+    """
+    total = 0
+    stack = [path]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file():
+                            total += entry.stat().st_size
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    return total
 
 
 async def scan_downloads(downloads_path: str | None = None) -> list[dict]:
     """Scan downloads directory for files to organize.
 
+    The scan runs in a worker thread so large download folders don't block
+    the event loop.
+
     Args:
         downloads_path: Path to downloads directory (uses config default if None)
 
     Returns:
         List of items with basic info (not analyzed yet)
     """
+    return await asyncio.to_thread(lambda: list(iter_downloads(downloads_path)))
+
+
+def iter_downloads(downloads_path: str | None = None) -> Iterator[dict]:
+    """Yield downloads directory items one at a time (blocking).
+
+    Each item is yielded as soon as it is inspected, so callers can stream
+    results before slow folder size calculations for later items finish.
+
+    Args:
+        downloads_path: Path to downloads directory (uses config default if None)
+
+    Yields:
+        Item dicts with basic info (not analyzed yet)
+    """
     path = Path(downloads_path or f"{settings.MEDIA_BASE}/Downloads")
 
     if not path.exists():
-        return []
+        return
+
+    # DirEntry caches its file type and stat result, so each item costs at
+    # most one stat() however many times it is inspected below
+    with os.scandir(path) as it:
+        all_items = [entry for entry in it if not entry.name.startswith('.')]
+    # Sort by plain name strings rather than comparing Path objects
+    all_items.sort(key=attrgetter('name'))
+    folder_index = build_folder_index(all_items)
 
-    all_items = [item for item in path.iterdir() if not item.name.startswith('.')]
+    for entry in all_items:
+        is_directory = entry.is_dir()
 
-    items = []
-    for item in sorted(all_items):
-        if is_companion_file(item, all_items):
+        # Directories are never companion files
+        if not is_directory and is_companion_file(entry, folder_index):
             continue
 
         item_type = 'unknown'
         size = 0
 
-        if item.is_file():
-            size = item.stat().st_size
-            if is_video_file(str(item)):
+        if entry.is_file():
+            size = entry.stat().st_size
+            ext = os.path.splitext(entry.name)[1].lower()
+            if ext in _VIDEO_EXT:
                 item_type = 'video'
-            elif is_audio_file(str(item)):
+            elif ext in _AUDIO_EXT:
                 item_type = 'audio'
-        elif item.is_dir():
+        elif is_directory:
             item_type = 'folder'
             # Calculate total size
-            for f in item.rglob('*'):
-                if f.is_file():
-                    size += f.stat().st_size
+            size = _dir_size(entry.path)
 
-        items.append({
-            'path': str(item),
-            'name': item.name,
+        yield {
+            'path': entry.path,
+            'name': entry.name,
             'type': item_type,
-            'is_directory': item.is_dir(),
+            'is_directory': is_directory,
             'size': size,
             'size_formatted': format_size(size)
-        })
-
-    return items
+        }
 
 
 def format_size(size_bytes: int) -> str:
     """Format bytes as human-readable size."""
-    for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-        if size_bytes < 1024:
-            return f"{size_bytes:.1f} {unit}"
-        size_bytes /= 1024
-    return f"{size_bytes:.1f} PB"
+    if size_bytes < 1024:
+        return f"{size_bytes:.1f} B"
+    # Each unit is 2**10 of the previous one, so the bit length picks it
+    idx = min((int(size_bytes).bit_length() - 1) // 10, len(_SIZE_UNITS) - 1)
+    return f"{size_bytes / (1 << (idx * 10)):.1f} {_SIZE_UNITS[idx]}"
+
+
+def _fast_move(src: str, dst: str) -> None:
+    """Move a file, renaming in place when source and destination share a device.
+
+    shutil.move does the same rename internally, but only after its own
+    Python-level stat checks; fall back to it for cross-device moves.
+    """
+    try:
+        os.rename(src, dst)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        shutil.move(src, dst)
+
+
+def _move_files(moves: list[tuple[Path, Path]], result: dict) -> None:
+    """Run planned (source, destination) file moves concurrently.
+
+    Cross-device moves fall back to copy + delete, so
+    overlapping moves in a thread pool keeps the disk/network busy. Each
+    completed destination is recorded in result['files_moved']; if any move
+    fails, the first error is raised once all of them have finished.
+    """
+    if not moves:
+        return
+
+    with ThreadPoolExecutor(max_workers=min(MAX_MOVE_WORKERS, len(moves))) as executor:
+        futures = [executor.submit(_fast_move, str(src), str(dest)) for src, dest in moves]
+
+    first_error = None
+    for (_, dest), future in zip(moves, futures):
+        error = future.exception()
+        if error is not None:
+            first_error = first_error or error
+        else:
+            result['files_moved'].append(str(dest))
+    if first_error is not None:
+        raise first_error
 
 
 async def move_item(
@@ -268,6 +456,27 @@ async def move_item(
 ) -> dict:
     """Move a file/folder to the appropriate library location.
 
+    The move runs in a worker thread, since copying across filesystems or
+    to a network mount can take minutes.
+
+    Args:
+        source_path: Path to source file/folder
+        media_type: Type of media ('movie', 'tv', 'music')
+        metadata: Metadata dict with title, year, season, episode, artist, album
+
+    Returns:
+        Result dict with status, destination, and any errors
+    """
+    return await asyncio.to_thread(_move_item_sync, source_path, media_type, metadata)
+
+
+def _move_item_sync(
+    source_path: str,
+    media_type: Literal['movie', 'tv', 'music'],
+    metadata: dict
+) -> dict:
+    """Move a file/folder to the appropriate library location (blocking).
+
     Args:
         source_path: Path to source file/folder
         media_type: Type of media ('movie', 'tv', 'music')
@@ -281,7 +490,10 @@ async def move_item(
     logger.info(f"Starting move operation: {source_path} -> {media_type}")
     logger.debug(f"Metadata: {metadata}")
 
-    if not source.exists():
+    # One stat() answers both "does it exist" and "is it a file"
+    try:
+        source_is_file = stat.S_ISREG(os.stat(source).st_mode)
+    except OSError:
         error_msg = f"Source not found: {source_path}"
         logger.error(error_msg)
         return {
@@ -313,7 +525,7 @@ async def move_item(
             dest_folder.mkdir(parents=True, exist_ok=True)
             logger.info(f"Created destination folder: {dest_folder}")
 
-            if source.is_file():
+            if source_is_file:
                 # Move single file
                 dest_file = dest_folder / source.name
                 original_file = str(dest_file)
@@ -322,31 +534,37 @@ async def move_item(
                     result['warnings'].append(f"File renamed to avoid conflict: {dest_file.name}")
 
                 logger.info(f"Moving file: {source} -> {dest_file}")
-                shutil.move(str(source), str(dest_file))
+                _fast_move(str(source), str(dest_file))
                 result['files_moved'].append(str(dest_file))
             else:
                 # Move entire folder contents (preserves subtitles, images, etc.)
-                all_files = list(source.rglob('*'))
-                files_to_move = [f for f in all_files if f.is_file()]
+                files_to_move = [Path(entry.path) for entry in _walk_files(source)]
 
                 logger.info(f"Moving entire folder with {len(files_to_move)} files (preserving all companion files)")
 
+                moves: list[tuple[Path, Path]] = []
+                reserved: set[Path] = set()
+                created_dirs: set[Path] = {dest_folder}
                 for f in files_to_move:
                     # Preserve directory structure for files in subdirectories
                     relative_path = f.relative_to(source)
                     dest_file = dest_folder / relative_path
 
-                    # Create subdirectories if needed
-                    dest_file.parent.mkdir(parents=True, exist_ok=True)
+                    # Create subdirectories if needed (once per directory)
+                    if dest_file.parent not in created_dirs:
+                        dest_file.parent.mkdir(parents=True, exist_ok=True)
+                        created_dirs.add(dest_file.parent)
 
                     original_file = str(dest_file)
-                    dest_file = resolve_conflict(dest_file)
+                    dest_file = resolve_conflict(dest_file, reserved)
                     if str(dest_file) != original_file:
                         result['warnings'].append(f"File renamed to avoid conflict: {dest_file.name}")
 
                     logger.info(f"Moving file: {relative_path}")
-                    shutil.move(str(f), str(dest_file))
-                    result['files_moved'].append(str(dest_file))
+                    reserved.add(dest_file)
+                    moves.append((f, dest_file))
+
+                _move_files(moves, result)
 
                 # Clean up empty source folder
                 cleanup_info = _remove_empty_dirs(source)
@@ -360,11 +578,12 @@ async def move_item(
             season = metadata.get('season')
             episode = metadata.get('episode')
 
-            dest_folder = generate_tv_path(title, season)
+            show_root = generate_tv_path(title)
+            dest_folder = show_root / f"Season {season:02d}" if season is not None else show_root
             dest_folder.mkdir(parents=True, exist_ok=True)
             logger.info(f"Created destination folder: {dest_folder}")
 
-            if source.is_file():
+            if source_is_file:
                 # Single episode file
                 if season is not None and episode is not None:
                     new_name = generate_tv_filename(title, season, episode, source.suffix)
@@ -377,67 +596,80 @@ async def move_item(
                     result['warnings'].append(f"File renamed to avoid conflict: {dest_file.name}")
 
                 logger.info(f"Moving TV episode: {source} -> {dest_file}")
-                shutil.move(str(source), str(dest_file))
+                _fast_move(str(source), str(dest_file))
                 result['files_moved'].append(str(dest_file))
             else:
                 # Folder with multiple episodes (season pack)
-                from services.metadata import parse_filename
-
-                all_files = list(source.rglob('*'))
-                files_to_move = [f for f in all_files if f.is_file()]
-                video_files = [f for f in files_to_move if is_video_file(str(f))]
-
-                logger.info(f"Moving entire folder with {len(files_to_move)} files (preserving all companion files)")
-
-                # Process video files with proper naming
+                # Split video and companion files in a single walk
+                video_files: list[Path] = []
+                non_video_files: list[Path] = []
+                for entry in _walk_files(source):
+                    ext = os.path.splitext(entry.name)[1].lower()
+                    (video_files if ext in _VIDEO_EXT else non_video_files).append(Path(entry.path))
+
+                logger.info(f"Moving entire folder with {len(video_files) + len(non_video_files)} files (preserving all companion files)")
+
+                # Process video files with proper naming. Episodes share a
+                # few season folders, so create each one only once.
+                clean_title = sanitize_filename(title)
+                season_folders: dict[int | None, Path] = {}
+                moves: list[tuple[Path, Path]] = []
+                reserved: set[Path] = set()
+                created_dirs: set[Path] = {dest_folder}
                 for f in video_files:
                     parsed = parse_filename(f.name)
                     ep_season = parsed.get('season', season)
                     ep_episode = parsed.get('episode')
 
                     # Determine correct season folder
-                    ep_dest_folder = generate_tv_path(title, ep_season)
-                    ep_dest_folder.mkdir(parents=True, exist_ok=True)
+                    ep_dest_folder = season_folders.get(ep_season)
+                    if ep_dest_folder is None:
+                        ep_dest_folder = show_root / f"Season {ep_season:02d}" if ep_season is not None else show_root
+                        ep_dest_folder.mkdir(parents=True, exist_ok=True)
+                        season_folders[ep_season] = ep_dest_folder
 
                     if ep_season is not None and ep_episode is not None:
-                        new_name = generate_tv_filename(title, ep_season, ep_episode, f.suffix)
+                        new_name = _format_tv_filename(clean_title, ep_season, ep_episode, f.suffix)
                     else:
                         new_name = f.name
                     dest_file = ep_dest_folder / new_name
                     original_file = str(dest_file)
-                    dest_file = resolve_conflict(dest_file)
+                    dest_file = resolve_conflict(dest_file, reserved)
                     if str(dest_file) != original_file:
                         result['warnings'].append(f"File renamed to avoid conflict: {dest_file.name}")
 
                     logger.info(f"Moving TV episode: {f.name} -> {dest_file}")
-                    shutil.move(str(f), str(dest_file))
-                    result['files_moved'].append(str(dest_file))
+                    reserved.add(dest_file)
+                    moves.append((f, dest_file))
 
                 # Move non-video files (subtitles, images, etc.) to the season folder
-                non_video_files = [f for f in files_to_move if not is_video_file(str(f))]
                 for f in non_video_files:
                     # Preserve relative path for companion files
                     relative_path = f.relative_to(source)
                     dest_file = dest_folder / relative_path
 
-                    # Create subdirectories if needed
-                    dest_file.parent.mkdir(parents=True, exist_ok=True)
+                    # Create subdirectories if needed (once per directory)
+                    if dest_file.parent not in created_dirs:
+                        dest_file.parent.mkdir(parents=True, exist_ok=True)
+                        created_dirs.add(dest_file.parent)
 
                     original_file = str(dest_file)
-                    dest_file = resolve_conflict(dest_file)
+                    dest_file = resolve_conflict(dest_file, reserved)
                     if str(dest_file) != original_file:
                         result['warnings'].append(f"File renamed to avoid conflict: {dest_file.name}")
 
                     logger.info(f"Moving companion file: {relative_path}")
-                    shutil.move(str(f), str(dest_file))
-                    result['files_moved'].append(str(dest_file))
+                    reserved.add(dest_file)
+                    moves.append((f, dest_file))
+
+                _move_files(moves, result)
 
                 # Clean up empty source folder
                 cleanup_info = _remove_empty_dirs(source)
                 if cleanup_info.get('dirs_removed'):
                     logger.info(f"Removed {len(cleanup_info['dirs_removed'])} empty directories during cleanup")
 
-            result['destination'] = str(generate_tv_path(title))
+            result['destination'] = str(show_root)
 
         elif media_type == 'music':
             artist = metadata.get('artist') or 'Unknown Artist'
@@ -452,7 +684,7 @@ async def move_item(
             dest_folder.mkdir(parents=True, exist_ok=True)
             logger.info(f"Created destination folder: {dest_folder}")
 
-            if source.is_file():
+            if source_is_file:
                 dest_file = dest_folder / source.name
                 original_file = str(dest_file)
                 dest_file = resolve_conflict(dest_file)
@@ -460,31 +692,37 @@ async def move_item(
                     result['warnings'].append(f"File renamed to avoid conflict: {dest_file.name}")
 
                 logger.info(f"Moving music file: {source} -> {dest_file}")
-                shutil.move(str(source), str(dest_file))
+                _fast_move(str(source), str(dest_file))
                 result['files_moved'].append(str(dest_file))
             else:
                 # Move entire album folder (preserves cover art, lyrics, etc.)
-                all_files = list(source.rglob('*'))
-                files_to_move = [f for f in all_files if f.is_file()]
+                files_to_move = [Path(entry.path) for entry in _walk_files(source)]
 
                 logger.info(f"Moving entire folder with {len(files_to_move)} files (preserving all companion files)")
 
+                moves: list[tuple[Path, Path]] = []
+                reserved: set[Path] = set()
+                created_dirs: set[Path] = {dest_folder}
                 for f in files_to_move:
                     # Preserve directory structure for files in subdirectories
                     relative_path = f.relative_to(source)
                     dest_file = dest_folder / relative_path
 
-                    # Create subdirectories if needed
-                    dest_file.parent.mkdir(parents=True, exist_ok=True)
+                    # Create subdirectories if needed (once per directory)
+                    if dest_file.parent not in created_dirs:
+                        dest_file.parent.mkdir(parents=True, exist_ok=True)
+                        created_dirs.add(dest_file.parent)
 
                     original_file = str(dest_file)
-                    dest_file = resolve_conflict(dest_file)
+                    dest_file = resolve_conflict(dest_file, reserved)
                     if str(dest_file) != original_file:
                         result['warnings'].append(f"File renamed to avoid conflict: {dest_file.name}")
 
                     logger.info(f"Moving file: {relative_path}")
-                    shutil.move(str(f), str(dest_file))
-                    result['files_moved'].append(str(dest_file))
+                    reserved.add(dest_file)
+                    moves.append((f, dest_file))
+
+                _move_files(moves, result)
 
                 # Clean up empty source folder
                 cleanup_info = _remove_empty_dirs(source)
@@ -530,38 +768,42 @@ def _remove_empty_dirs(path: Path) -> dict:
     if not path.is_dir():
         return cleanup_info
 
-    try:
-        # First, recursively clean up subdirectories
-        for item in path.iterdir():
-            if item.is_dir():
-                subdir_info = _remove_empty_dirs(item)
-                cleanup_info['files_removed'].extend(subdir_info['files_removed'])
-                cleanup_info['dirs_removed'].extend(subdir_info['dirs_removed'])
-
-        # Check if directory is now empty (or only contains hidden/small files)
-        remaining = [f for f in path.iterdir() if not f.name.startswith('.')]
-        if not remaining:
-            # Remove hidden files first
-            for f in path.iterdir():
-                if f.is_file():
-                    logger.debug(f"Removing leftover file during cleanup: {f}")
-                    f.unlink()
-                    cleanup_info['files_removed'].append(str(f))
-
-            logger.info(f"Removing empty directory: {path}")
-            path.rmdir()
-            cleanup_info['dirs_removed'].append(str(path))
-        elif remaining:
-            # Log what's preventing cleanup
-            remaining_files = [f for f in remaining if f.is_file()]
-            remaining_dirs = [f for f in remaining if f.is_dir()]
-            if remaining_files:
-                logger.info(f"Cannot remove {path}: {len(remaining_files)} files still present ({', '.join(f.name for f in remaining_files[:3])}{'...' if len(remaining_files) > 3 else ''})")
-            if remaining_dirs:
-                logger.debug(f"Cannot remove {path}: {len(remaining_dirs)} non-empty subdirectories still present")
-
-    except OSError as e:
-        logger.warning(f"Could not clean up directory {path}: {e}")
+    def log_walk_error(e: OSError) -> None:
+        logger.warning(f"Could not clean up directory {e.filename}: {e}")
+
+    # Bottom-up, so each directory is visited after all of its subdirectories
+    removed: set[str] = set()
+    for dirpath, dirnames, filenames in os.walk(path, topdown=False, onerror=log_walk_error):
+        remaining_dirs = [
+            name for name in dirnames
+            if not name.startswith('.') and os.path.join(dirpath, name) not in removed
+        ]
+        remaining_files = [name for name in filenames if not name.startswith('.')]
+
+        try:
+            # Check if directory is now empty (or only contains hidden files)
+            if not remaining_files and not remaining_dirs:
+                # Remove hidden files first
+                for name in filenames:
+                    file_path = os.path.join(dirpath, name)
+                    if os.path.isfile(file_path):
+                        logger.debug(f"Removing leftover file during cleanup: {file_path}")
+                        os.unlink(file_path)
+                        cleanup_info['files_removed'].append(file_path)
+
+                logger.info(f"Removing empty directory: {dirpath}")
+                os.rmdir(dirpath)
+                removed.add(dirpath)
+                cleanup_info['dirs_removed'].append(dirpath)
+            else:
+                # Log what's preventing cleanup
+                if remaining_files:
+                    logger.info(f"Cannot remove {dirpath}: {len(remaining_files)} files still present ({', '.join(remaining_files[:3])}{'...' if len(remaining_files) > 3 else ''})")
+                if remaining_dirs:
+                    logger.debug(f"Cannot remove {dirpath}: {len(remaining_dirs)} non-empty subdirectories still present")
+
+        except OSError as e:
+            logger.warning(f"Could not clean up directory {dirpath}: {e}")
 
     return cleanup_info
 
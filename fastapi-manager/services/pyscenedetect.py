@@ -1,54 +1,96 @@
 """PySceneDetect service for splitting commercial compilation videos."""
 
 import asyncio
+import atexit
 import json
 import logging
 import os
 import re
+from collections import deque
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Optional, TextIO
 
 from config import settings
+from services.data_files import JsonlHistory, read_tail_lines
 
 logger = logging.getLogger(__name__)
 
 DATA_DIR = Path("/app/data")
-PROCESS_HISTORY_FILE = DATA_DIR / "scene_detect_history.json"
+PROCESS_HISTORY_FILE = DATA_DIR / "scene_detect_history.jsonl"
+LEGACY_PROCESS_HISTORY_FILE = DATA_DIR / "scene_detect_history.json"
 PROCESS_LOG_FILE = DATA_DIR / "scene_detect.log"
 
+# Entries kept in the processing history, and the file size past which
+# older entries are trimmed from it
+PROCESS_HISTORY_LIMIT = 100
+PROCESS_HISTORY_COMPACT_BYTES = 1024 * 1024
+
+# Lines of scenedetect output kept in memory for errors and results
+OUTPUT_TAIL_LINES = 200
+
 VIDEO_EXTENSIONS = {".mkv", ".mp4", ".avi", ".mov", ".wmv", ".flv", ".webm", ".m4v", ".ts", ".m2ts"}
 
+# Split outputs are named "<base>-NNN.<ext>"
+_SPLIT_OUTPUT_RE = re.compile(r"-\d{3,}\.[^.]+$")
+# Scene list entries in either output format (groups 1-3 or 4-6):
+#   "Scene  1: 00:00:00.000 - 00:01:23.456"
+#   "| 1 | 00:00:00.000 | 1 | 00:01:23.456 |"
+# Whitespace is [^\S\n] so a match never spans lines
+_SCENE_ANY_RE = re.compile(
+    r"Scene[^\S\n]+(\d+):[^\S\n]+(\d+:\d+:\d+\.\d+)[^\S\n]+-[^\S\n]+(\d+:\d+:\d+\.\d+)"
+    r"|\|[^\S\n]*(\d+)[^\S\n]*\|[^\S\n]*(\d+:\d+:\d+\.\d+)[^\S\n]*\|[^\S\n]*\d+[^\S\n]*\|[^\S\n]*(\d+:\d+:\d+\.\d+)"
+)
+
+
+# Set once the data directory has been created
+_data_dir_ready = False
+
 
 def _ensure_data_dir() -> None:
     """Ensure data directory exists."""
+    global _data_dir_ready
+    if _data_dir_ready:
+        return
     DATA_DIR.mkdir(parents=True, exist_ok=True)
+    _data_dir_ready = True
+
+
+_process_history = JsonlHistory(
+    PROCESS_HISTORY_FILE, LEGACY_PROCESS_HISTORY_FILE, PROCESS_HISTORY_LIMIT, PROCESS_HISTORY_COMPACT_BYTES
+)
 
 
 def _load_process_history() -> list[dict]:
-    """Load processing history from JSON file."""
+    """Load the most recent processing history entries."""
     _ensure_data_dir()
-    if PROCESS_HISTORY_FILE.exists():
-        try:
-            return json.loads(PROCESS_HISTORY_FILE.read_text())
-        except (json.JSONDecodeError, OSError):
-            return []
-    return []
+    return _process_history.load()
 
 
-def _save_process_history(history: list[dict]) -> None:
-    """Save processing history to JSON file."""
+def _save_process_history(entries: list[dict]) -> None:
+    """Append entries to the processing history file."""
     _ensure_data_dir()
-    history = history[-100:]
-    PROCESS_HISTORY_FILE.write_text(json.dumps(history, indent=2, default=str))
+    _process_history.append(entries)
+
+
+# Log file handle, opened on first use and kept open (line buffered)
+_log_fh: Optional[TextIO] = None
+
+
+def _get_log_fh() -> TextIO:
+    """Get the open processing log file handle."""
+    global _log_fh
+    if _log_fh is None:
+        _ensure_data_dir()
+        _log_fh = open(PROCESS_LOG_FILE, "a", buffering=1)
+        atexit.register(_log_fh.close)
+    return _log_fh
 
 
 def _append_log(message: str) -> None:
     """Append message to processing log file."""
-    _ensure_data_dir()
     timestamp = datetime.now(timezone.utc).isoformat()
-    with open(PROCESS_LOG_FILE, "a") as f:
-        f.write(f"[{timestamp}] {message}\n")
+    _get_log_fh().write(f"[{timestamp}] {message}\n")
 
 
 def _get_processed_marker_path(video_path: Path) -> Path:
@@ -74,7 +116,7 @@ def _mark_as_processed(video_path: Path, scenes_count: int) -> None:
 
 def _is_split_output(filename: str) -> bool:
     """Check if a filename appears to be a split output (has -NNN suffix)."""
-    return bool(re.search(r"-\d{3,}\.[^.]+$", filename))
+    return _SPLIT_OUTPUT_RE.search(filename) is not None
 
 
 def get_commercials_directory() -> Path:
@@ -98,17 +140,21 @@ def find_videos_to_process(directory: Optional[Path] = None) -> list[Path]:
         logger.warning(f"Directory does not exist: {directory}")
         return []
 
+    # Filter on the bare entry names first; only the survivors become Paths
+    # and cost a stat() for their processed marker
     videos = []
-    for file_path in directory.iterdir():
-        if not file_path.is_file():
-            continue
-        if file_path.suffix.lower() not in VIDEO_EXTENSIONS:
-            continue
-        if _is_split_output(file_path.name):
-            continue
-        if _is_already_processed(file_path):
-            continue
-        videos.append(file_path)
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if os.path.splitext(entry.name)[1].lower() not in VIDEO_EXTENSIONS:
+                continue
+            if _is_split_output(entry.name):
+                continue
+            if not entry.is_file():
+                continue
+            file_path = Path(entry.path)
+            if _is_already_processed(file_path):
+                continue
+            videos.append(file_path)
 
     return sorted(videos)
 
@@ -164,11 +210,10 @@ async def detect_scenes(
             *cmd,
             stdout=asyncio.subprocess.PIPE,
             stderr=asyncio.subprocess.STDOUT,
-            env={**os.environ},
         )
 
-        stdout, _ = await process.communicate()
-        output = stdout.decode("utf-8", errors="replace") if stdout else ""
+        output, scenes = await _read_scene_output(process.stdout)
+        await process.wait()
 
         ended_at = datetime.now(timezone.utc)
         duration = (ended_at - started_at).total_seconds()
@@ -183,7 +228,6 @@ async def detect_scenes(
                 "duration_seconds": duration,
             }
 
-        scenes = _parse_scene_list(output)
         _append_log(f"Detected {len(scenes)} scenes in {video_path.name} ({duration:.1f}s)")
 
         return {
@@ -212,36 +256,50 @@ async def detect_scenes(
         }
 
 
+async def _read_scene_output(stream: asyncio.StreamReader) -> tuple[str, list[dict]]:
+    """Read scenedetect output as it is produced, parsing scenes line by line.
+
+    Reads fixed-size chunks rather than lines, since progress bars redraw
+    with carriage returns and can make very long "lines". Only the last
+    OUTPUT_TAIL_LINES lines are kept in memory.
+
+    Returns:
+        (tail of the decoded output, parsed scenes)
+    """
+    tail: deque[str] = deque(maxlen=OUTPUT_TAIL_LINES)
+    scenes = []
+
+    def add_line(line: bytes) -> None:
+        text = line.decode("utf-8", errors="replace")
+        tail.append(text)
+        scenes.extend(_parse_scene_list(text))
+
+    pending = b""
+    while chunk := await stream.read(64 * 1024):
+        *lines, pending = re.split(rb"[\r\n]", pending + chunk)
+        for line in lines:
+            if line:
+                add_line(line)
+    if pending:
+        add_line(pending)
+
+    return "\n".join(tail), scenes
+
+
 def _parse_scene_list(output: str) -> list[dict]:
     """Parse scene list from scenedetect output."""
     scenes = []
-    lines = output.strip().split("\n")
 
-    for line in lines:
-        # Try format: "Scene  1: 00:00:00.000 - 00:01:23.456"
-        match = re.search(
-            r"Scene\s+(\d+):\s+(\d+:\d+:\d+\.\d+)\s+-\s+(\d+:\d+:\d+\.\d+)",
-            line
-        )
-        if match:
-            scenes.append({
-                "scene_number": int(match.group(1)),
-                "start_time": match.group(2),
-                "end_time": match.group(3),
-            })
-            continue
-
-        # Try format from table: "| 1 | 00:00:00.000 | 1 | 00:01:23.456 |"
-        match = re.search(
-            r"\|\s*(\d+)\s*\|\s*(\d+:\d+:\d+\.\d+)\s*\|\s*\d+\s*\|\s*(\d+:\d+:\d+\.\d+)",
-            line
-        )
-        if match:
-            scenes.append({
-                "scene_number": int(match.group(1)),
-                "start_time": match.group(2),
-                "end_time": match.group(3),
-            })
+    for match in _SCENE_ANY_RE.finditer(output):
+        if match.group(1) is not None:
+            number, start_time, end_time = match.group(1, 2, 3)
+        else:
+            number, start_time, end_time = match.group(4, 5, 6)
+        scenes.append({
+            "scene_number": int(number),
+            "start_time": start_time,
+            "end_time": end_time,
+        })
 
     return scenes
 
@@ -251,6 +309,7 @@ async def split_video(
     threshold: float = 27.0,
     min_scene_len: float = 0.5,
     algorithm: str = "content",
+    record_history: bool = True,
 ) -> dict:
     """Split a video into scenes using PySceneDetect.
 
@@ -259,6 +318,8 @@ async def split_video(
         threshold: Content detector threshold (default 27.0)
         min_scene_len: Minimum scene length in seconds (default 0.5)
         algorithm: Detection algorithm - 'content', 'adaptive', 'threshold', or 'hash'
+        record_history: Append a successful split to the processing history
+            (batch callers save their entries together instead)
 
     Returns:
         Dict with success status and split results
@@ -303,7 +364,6 @@ async def split_video(
             *cmd,
             stdout=asyncio.subprocess.PIPE,
             stderr=asyncio.subprocess.STDOUT,
-            env={**os.environ},
         )
 
         stdout, _ = await process.communicate()
@@ -328,25 +388,19 @@ async def split_video(
 
         _append_log(f"Split {video_path.name} into {scenes_count} clips ({duration:.1f}s)")
 
-        history = _load_process_history()
-        history.append({
-            "input_file": str(video_path),
-            "output_files": [str(f) for f in output_files],
-            "scenes_count": scenes_count,
-            "started_at": started_at.isoformat(),
-            "duration_seconds": duration,
-            "success": True,
-        })
-        _save_process_history(history)
-
-        return {
+        result = {
             "success": True,
             "input_file": str(video_path),
             "output_files": [str(f) for f in output_files],
             "scenes_count": scenes_count,
+            "started_at": started_at.isoformat(),
             "duration_seconds": duration,
             "output": output,
         }
+        if record_history:
+            _save_process_history([_history_entry(result)])
+
+        return result
 
     except FileNotFoundError:
         _append_log("ERROR: scenedetect not found in PATH")
@@ -364,6 +418,18 @@ async def split_video(
         }
 
 
+def _history_entry(result: dict) -> dict:
+    """Build a processing history entry from a successful split_video result."""
+    return {
+        "input_file": result["input_file"],
+        "output_files": result["output_files"],
+        "scenes_count": result["scenes_count"],
+        "started_at": result["started_at"],
+        "duration_seconds": result["duration_seconds"],
+        "success": True,
+    }
+
+
 def _find_split_files(output_dir: Path, base_name: str) -> list[Path]:
     """Find split output files matching the base name pattern."""
     # Match base_name-NNN.ext where NNN is 1 or more digits
@@ -412,17 +478,37 @@ async def process_directory(
 
     _append_log(f"Found {len(videos)} videos to process")
 
-    results = []
-    processed_count = 0
+    # Split up to SCENE_DETECT_CONCURRENCY videos at a time; each one spends
+    # most of its time in its own scenedetect/ffmpeg process
+    semaphore = asyncio.Semaphore(max(1, settings.SCENE_DETECT_CONCURRENCY))
+
+    async def split_one(video_path: Path) -> dict:
+        async with semaphore:
+            return await split_video(
+                video_path, threshold, min_scene_len, algorithm, record_history=False
+            )
 
-    for video_path in videos:
-        result = await split_video(video_path, threshold, min_scene_len, algorithm)
+    outcomes = await asyncio.gather(
+        *(split_one(video_path) for video_path in videos),
+        return_exceptions=True,
+    )
+
+    results = []
+    history_entries = []
+    for video_path, result in zip(videos, outcomes):
+        if isinstance(result, Exception):
+            _append_log(f"ERROR splitting video: {result}")
+            result = {"success": False, "error": str(result), "output_files": []}
+        elif result["success"]:
+            history_entries.append(_history_entry(result))
         results.append({
             "file": str(video_path),
             "result": result,
         })
-        if result["success"]:
-            processed_count += 1
+    processed_count = len(history_entries)
+
+    if history_entries:
+        _save_process_history(history_entries)
 
     _append_log(f"Processed {processed_count}/{len(videos)} videos successfully")
 
@@ -479,8 +565,7 @@ def get_process_logs(lines: int = 100) -> list[str]:
         return []
 
     try:
-        all_lines = PROCESS_LOG_FILE.read_text().strip().split("\n")
-        return all_lines[-lines:] if all_lines else []
+        return read_tail_lines(PROCESS_LOG_FILE, lines)
     except OSError:
         return []
 
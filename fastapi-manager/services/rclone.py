@@ -1,51 +1,79 @@
 """rclone service for bidirectional cloud sync operations."""
 
 import asyncio
-import json
+import atexit
 import os
 import subprocess
+from collections import deque
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Literal
+from typing import Literal, Optional, TextIO
 
 from config import settings
+from services.data_files import JsonlHistory, read_tail_lines
 
 DATA_DIR = Path("/app/data")
-SYNC_HISTORY_FILE = DATA_DIR / "sync_history.json"
+SYNC_HISTORY_FILE = DATA_DIR / "sync_history.jsonl"
+LEGACY_SYNC_HISTORY_FILE = DATA_DIR / "sync_history.json"
 SYNC_LOG_FILE = DATA_DIR / "sync.log"
 RESYNC_MARKER_FILE = DATA_DIR / ".resync_done"
 
+# Entries kept in the sync history, and the file size past which older
+# entries are trimmed from it
+SYNC_HISTORY_LIMIT = 100
+SYNC_HISTORY_COMPACT_BYTES = 1024 * 1024
+
+# Lines of rclone output kept in memory for the sync result
+OUTPUT_TAIL_LINES = 500
+
 
 def _ensure_data_dir() -> None:
     """Ensure data directory exists."""
     DATA_DIR.mkdir(parents=True, exist_ok=True)
 
 
+_sync_history = JsonlHistory(
+    SYNC_HISTORY_FILE, LEGACY_SYNC_HISTORY_FILE, SYNC_HISTORY_LIMIT, SYNC_HISTORY_COMPACT_BYTES
+)
+
+
 def _load_sync_history() -> list[dict]:
-    """Load sync history from JSON file."""
+    """Load the most recent sync history entries."""
     _ensure_data_dir()
-    if SYNC_HISTORY_FILE.exists():
-        try:
-            return json.loads(SYNC_HISTORY_FILE.read_text())
-        except (json.JSONDecodeError, OSError):
-            return []
-    return []
+    return _sync_history.load()
 
 
-def _save_sync_history(history: list[dict]) -> None:
-    """Save sync history to JSON file."""
+def _save_sync_history(entries: list[dict]) -> None:
+    """Append entries to the sync history file."""
     _ensure_data_dir()
-    # Keep only last 100 entries
-    history = history[-100:]
-    SYNC_HISTORY_FILE.write_text(json.dumps(history, indent=2, default=str))
+    _sync_history.append(entries)
+
+
+# Log file handle, opened on first use and kept open. Writes are buffered
+# and flushed after each sync, before reading the log back, and at exit.
+_log_fh: Optional[TextIO] = None
+
+
+def _get_log_fh() -> TextIO:
+    """Get the open sync log file handle."""
+    global _log_fh
+    if _log_fh is None:
+        _ensure_data_dir()
+        _log_fh = open(SYNC_LOG_FILE, "a", buffering=64 * 1024)
+        atexit.register(_log_fh.close)
+    return _log_fh
+
+
+def _flush_log() -> None:
+    """Write any buffered sync log lines to disk."""
+    if _log_fh is not None:
+        _log_fh.flush()
 
 
 def _append_log(message: str) -> None:
     """Append message to sync log file."""
-    _ensure_data_dir()
     timestamp = datetime.now(timezone.utc).isoformat()
-    with open(SYNC_LOG_FILE, "a") as f:
-        f.write(f"[{timestamp}] {message}\n")
+    _get_log_fh().write(f"[{timestamp}] {message}\n")
 
 
 def _needs_resync() -> bool:
@@ -109,8 +137,8 @@ async def run_bisync(force_resync: bool = False) -> dict:
             env={**os.environ},
         )
 
-        stdout, _ = await process.communicate()
-        output = stdout.decode("utf-8", errors="replace") if stdout else ""
+        output = await _stream_output(process.stdout)
+        await process.wait()
 
         ended_at = datetime.now(timezone.utc)
         duration = (ended_at - started_at).total_seconds()
@@ -135,19 +163,19 @@ async def run_bisync(force_resync: bool = False) -> dict:
         _append_log(f"Bisync completed: {status_msg} in {duration:.1f}s")
 
         # Save to history
-        history = _load_sync_history()
-        history.append({
+        _save_sync_history([{
             "success": success,
             "started_at": started_at.isoformat(),
             "duration_seconds": duration,
             "resync_used": needs_resync,
-        })
-        _save_sync_history(history)
+        }])
+        _flush_log()
 
         return result
 
     except FileNotFoundError:
         _append_log("ERROR: rclone not found in PATH")
+        _flush_log()
         return {
             "success": False,
             "error": "rclone not found in PATH",
@@ -156,6 +184,7 @@ async def run_bisync(force_resync: bool = False) -> dict:
         }
     except Exception as e:
         _append_log(f"ERROR: {e}")
+        _flush_log()
         return {
             "success": False,
             "error": str(e),
@@ -164,6 +193,34 @@ async def run_bisync(force_resync: bool = False) -> dict:
         }
 
 
+async def _stream_output(stream: asyncio.StreamReader) -> str:
+    """Copy rclone output into the sync log as it arrives.
+
+    Only the last OUTPUT_TAIL_LINES lines are kept in memory, so a verbose
+    bisync of a large tree doesn't buffer its whole output.
+
+    Returns:
+        The tail of the output
+    """
+    log = _get_log_fh()
+    tail: deque[str] = deque(maxlen=OUTPUT_TAIL_LINES)
+
+    def add_line(line: bytes) -> None:
+        text = line.decode("utf-8", errors="replace")
+        log.write(text + "\n")
+        tail.append(text)
+
+    pending = b""
+    while chunk := await stream.read(64 * 1024):
+        *lines, pending = (pending + chunk).split(b"\n")
+        for line in lines:
+            add_line(line)
+    if pending:
+        add_line(pending)
+
+    return "\n".join(tail)
+
+
 def get_sync_status() -> dict:
     """Get the status of the last sync operation.
 
@@ -208,12 +265,12 @@ def get_sync_logs(lines: int = 100) -> list[str]:
     Returns:
         List of log lines
     """
+    _flush_log()
     if not SYNC_LOG_FILE.exists():
         return []
 
     try:
-        all_lines = SYNC_LOG_FILE.read_text().strip().split("\n")
-        return all_lines[-lines:] if all_lines else []
+        return read_tail_lines(SYNC_LOG_FILE, lines)
     except OSError:
         return []
 
@@ -209,42 +209,45 @@ async def check_remote_host() -> dict:
             "error": "Remote host or user not configured",
         }
 
-    # Test SSH connectivity
-    returncode, stdout, stderr = await _run_ssh_command("echo 'test'")
-    if returncode != 0:
+    # Probe connectivity, tools, hardware encoders and create the work
+    # directory in one SSH session; each section is introduced by a marker
+    # line so the combined output can be split back apart
+    probe_script = (
+        "echo '@@connected'; "
+        "FFMPEG=$(which ffmpeg) && echo \"@@ffmpeg $FFMPEG\"; "
+        "which ffprobe >/dev/null && echo '@@ffprobe'; "
+        "echo '@@encoders'; "
+        "[ -n \"$FFMPEG\" ] && \"$FFMPEG\" -hide_banner -encoders 2>/dev/null | grep h264; "
+        f"mkdir -p {settings.REMOTE_TRANSCODE_WORK_DIR}"
+    )
+    _, stdout, stderr = await _run_ssh_command(probe_script)
+    lines = stdout.splitlines()
+    if "@@connected" not in lines:
         return {
             "enabled": True,
             "accessible": False,
             "error": f"Cannot connect via SSH: {stderr}",
         }
 
-    # Check for ffmpeg
-    returncode, stdout, stderr = await _run_ssh_command("which ffmpeg")
-    ffmpeg_available = returncode == 0
-    ffmpeg_path = stdout.strip() if ffmpeg_available else None
-
-    # Check for ffprobe
-    returncode, stdout, stderr = await _run_ssh_command("which ffprobe")
-    ffprobe_available = returncode == 0
+    # Check for ffmpeg and ffprobe
+    ffmpeg_path = None
+    for line in lines:
+        if line.startswith("@@ffmpeg "):
+            ffmpeg_path = line[len("@@ffmpeg "):].strip() or None
+    ffmpeg_available = ffmpeg_path is not None
+    ffprobe_available = "@@ffprobe" in lines
 
     # Check for VideoToolbox support (macOS)
+    encoders = "\n".join(lines[lines.index("@@encoders") + 1:]) if "@@encoders" in lines else ""
     hardware_encoders = []
     if ffmpeg_available:
-        returncode, stdout, stderr = await _run_ssh_command(
-            f"{ffmpeg_path} -hide_banner -encoders 2>/dev/null | grep h264"
-        )
-        if "h264_videotoolbox" in stdout:
+        if "h264_videotoolbox" in encoders:
             hardware_encoders.append("videotoolbox")
-        if "h264_nvenc" in stdout:
+        if "h264_nvenc" in encoders:
             hardware_encoders.append("nvenc")
-        if "h264_vaapi" in stdout:
+        if "h264_vaapi" in encoders:
             hardware_encoders.append("vaapi")
 
-    # Create work directory
-    returncode, stdout, stderr = await _run_ssh_command(
-        f"mkdir -p {settings.REMOTE_TRANSCODE_WORK_DIR}"
-    )
-
     return {
         "enabled": True,
         "accessible": True,
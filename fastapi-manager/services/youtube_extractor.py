@@ -3,15 +3,54 @@
 import asyncio
 import json
 import logging
+import os
 import re
+import shutil
 from pathlib import Path
 from typing import Optional
+from uuid import uuid4
 
 from config import settings
 
 logger = logging.getLogger(__name__)
 
 
+async def _run_ytdlp(args: list[str]) -> tuple[int, bytes, bytes]:
+    """
+    Run yt-dlp with its own copy of the cookies file.
+
+    yt-dlp rewrites its cookie jar in place on exit, so runs sharing one
+    file could read or save a half-written jar. Each run works on a private
+    copy, which replaces the cookies file once the run succeeds.
+
+    Returns:
+        Tuple of (returncode, stdout, stderr)
+    """
+    cookies_path = Path(settings.YOUTUBE_COOKIES_FILE)
+    run_cookies = cookies_path.with_name(f".{cookies_path.name}.{uuid4().hex}")
+
+    try:
+        if cookies_path.exists():
+            shutil.copyfile(cookies_path, run_cookies)
+
+        process = await asyncio.create_subprocess_exec(
+            "yt-dlp",
+            "--cookies", str(run_cookies),
+            *args,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+
+        stdout, stderr = await process.communicate()
+
+        if process.returncode == 0 and run_cookies.exists():
+            os.replace(run_cookies, cookies_path)
+
+        return process.returncode, stdout, stderr
+    finally:
+        run_cookies.unlink(missing_ok=True)
+
+
 async def extract_playlist_info(url: str) -> dict:
     """
     Extract basic playlist information using yt-dlp.
@@ -25,11 +64,7 @@ async def extract_playlist_info(url: str) -> dict:
     Raises:
         RuntimeError: If extraction fails
     """
-    cookies_path = Path(settings.YOUTUBE_COOKIES_FILE)
-
     cmd = [
-        "yt-dlp",
-        "--cookies", str(cookies_path),
         "--dump-single-json",
         "--flat-playlist",
         "--no-warnings",
@@ -49,15 +84,9 @@ async def extract_playlist_info(url: str) -> dict:
     cmd.append(url)
 
     try:
-        process = await asyncio.create_subprocess_exec(
-            *cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-
-        stdout, stderr = await process.communicate()
+        returncode, stdout, stderr = await _run_ytdlp(cmd)
 
-        if process.returncode != 0:
+        if returncode != 0:
             error_msg = stderr.decode().strip()
             logger.error(f"yt-dlp failed: {error_msg}")
             raise RuntimeError(f"Failed to extract playlist info: {error_msg}")
@@ -97,11 +126,7 @@ async def extract_playlist_items(url: str, playlist_id: Optional[str] = None) ->
     Raises:
         RuntimeError: If extraction fails
     """
-    cookies_path = Path(settings.YOUTUBE_COOKIES_FILE)
-
     cmd = [
-        "yt-dlp",
-        "--cookies", str(cookies_path),
         "--dump-single-json",
         "--flat-playlist",
         "--no-warnings",
@@ -121,15 +146,9 @@ async def extract_playlist_items(url: str, playlist_id: Optional[str] = None) ->
     cmd.append(url)
 
     try:
-        process = await asyncio.create_subprocess_exec(
-            *cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
+        returncode, stdout, stderr = await _run_ytdlp(cmd)
 
-        stdout, stderr = await process.communicate()
-
-        if process.returncode != 0:
+        if returncode != 0:
             error_msg = stderr.decode().strip()
             logger.error(f"yt-dlp failed: {error_msg}")
             raise RuntimeError(f"Failed to extract playlist items: {error_msg}")
@@ -204,8 +223,6 @@ async def check_cookies_valid() -> bool:
     test_url = "https://www.youtube.com/playlist?list=PLrAXtmErZgOeiKm4sgNOknGvNjby9efdf"  # YouTube Developers channel
 
     cmd = [
-        "yt-dlp",
-        "--cookies", str(cookies_path),
         "--dump-single-json",
         "--flat-playlist",
         "--playlist-end", "1",  # Only check first video
@@ -214,15 +231,9 @@ async def check_cookies_valid() -> bool:
     ]
 
     try:
-        process = await asyncio.create_subprocess_exec(
-            *cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-
-        stdout, stderr = await process.communicate()
+        returncode, stdout, stderr = await _run_ytdlp(cmd)
 
-        return process.returncode == 0
+        return returncode == 0
 
     except Exception as e:
         logger.error(f"Failed to check cookies validity: {e}")
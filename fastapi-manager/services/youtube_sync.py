@@ -405,11 +405,11 @@ class YouTubeSyncService:
                 )
 
                 # Add to download queue (pass session to avoid nested session lock)
-                job = self.download_queue.add_job(
+                job = self.download_queue.stage_job(
+                    session,
                     url=video_url,
                     media_type=MediaType.MUSIC,
                     metadata=metadata,
-                    session=session,
                 )
 
                 # Update item with download reference
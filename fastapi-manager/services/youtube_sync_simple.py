@@ -1,8 +1,10 @@
 """YouTube playlist sync service - Cookie-based approach."""
 
+import asyncio
 import logging
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Optional
 from uuid import uuid4
 
 from sqlalchemy import select
@@ -17,15 +19,98 @@ from services.download_queue import download_queue
 
 logger = logging.getLogger(__name__)
 
+# Queue entry that asks the sync worker for a full sync of every playlist
+SYNC_ALL_PLAYLISTS = "*"
+
 
 class YouTubeSyncSimple:
     """Manages YouTube playlist synchronization using cookies."""
 
     def __init__(self):
         self.is_running = False
-        self.current_playlist_id = None
-        self.current_playlist_title = None
+        # Playlists being synced right now, id -> title, oldest first
+        self.active_playlists: dict[str, str] = {}
         self.progress_message = ""
+        self._queue: asyncio.Queue[str] = asyncio.Queue()
+        self._queued_ids: set[str] = set()
+        self._worker_running = False
+
+    @property
+    def current_playlist_id(self) -> Optional[str]:
+        """ID of the longest-running playlist sync, if any."""
+        return next(iter(self.active_playlists), None)
+
+    @property
+    def current_playlist_title(self) -> Optional[str]:
+        """Title of the longest-running playlist sync, if any."""
+        return next(iter(self.active_playlists.values()), None)
+
+    def _update_progress_message(self):
+        """Describe the playlists currently being synced."""
+        titles = list(self.active_playlists.values())
+        if len(titles) == 1:
+            self.progress_message = f"Syncing playlist: {titles[0]}"
+        elif titles:
+            self.progress_message = f"Syncing {len(titles)} playlists: {', '.join(titles)}"
+
+    def enqueue_playlist(self, playlist_id: str) -> bool:
+        """Queue a single-playlist sync for the background worker.
+
+        Pass SYNC_ALL_PLAYLISTS to queue a full sync of every playlist.
+
+        Returns:
+            False if the playlist is already waiting in the queue
+        """
+        if playlist_id in self._queued_ids:
+            return False
+
+        self._queued_ids.add(playlist_id)
+        self._queue.put_nowait(playlist_id)
+        return True
+
+    async def start_worker(self):
+        """Start the background worker that runs queued playlist syncs one at a time.
+
+        Full syncs go through the same queue, so a full sync never overlaps
+        a single-playlist sync.
+        """
+        if self._worker_running:
+            logger.warning("YouTube sync worker already running")
+            return
+
+        self._worker_running = True
+        logger.info("YouTube sync worker started")
+
+        try:
+            while self._worker_running:
+                playlist_id = await self._queue.get()
+                self._queued_ids.discard(playlist_id)
+                try:
+                    if playlist_id == SYNC_ALL_PLAYLISTS:
+                        await self.sync_all_playlists()
+                    else:
+                        await sync_playlist_items(playlist_id)
+                except Exception:
+                    # Already logged by sync_playlist_items; keep the worker alive
+                    pass
+                finally:
+                    self._queue.task_done()
+        except asyncio.CancelledError:
+            logger.info("YouTube sync worker cancelled")
+        finally:
+            self._worker_running = False
+
+    def stop_worker(self):
+        """Stop the background worker."""
+        self._worker_running = False
+
+    def enqueue_all_playlists(self) -> bool:
+        """Queue a full sync of every playlist for the background worker.
+
+        Returns:
+            False if a full sync is already waiting in the queue
+        """
+        return self.enqueue_playlist(SYNC_ALL_PLAYLISTS)
 
     def _get_session(self):
         """Get database session."""
@@ -48,12 +133,28 @@ class YouTubeSyncSimple:
 
         try:
             with self._get_session() as session:
-                playlists = session.scalars(select(YouTubePlaylist)).all()
+                playlist_ids = session.scalars(select(YouTubePlaylist.id)).all()
 
-                for playlist in playlists:
-                    await self._sync_single_playlist(playlist.id)
+            # Extract up to YOUTUBE_SYNC_CONCURRENCY playlists at a time;
+            # one failing playlist doesn't stop the others
+            semaphore = asyncio.Semaphore(max(1, settings.YOUTUBE_SYNC_CONCURRENCY))
 
-            self.progress_message = "Sync completed for all playlists"
+            async def sync_one(playlist_id: str):
+                async with semaphore:
+                    await self._sync_single_playlist(playlist_id)
+
+            results = await asyncio.gather(
+                *(sync_one(playlist_id) for playlist_id in playlist_ids),
+                return_exceptions=True,
+            )
+
+            failures = [r for r in results if isinstance(r, Exception)]
+            if failures:
+                self.progress_message = (
+                    f"Sync completed for all playlists ({len(failures)} of {len(playlist_ids)} failed)"
+                )
+            else:
+                self.progress_message = "Sync completed for all playlists"
 
         except Exception as e:
             logger.error(f"Error syncing playlists: {e}")
@@ -61,8 +162,7 @@ class YouTubeSyncSimple:
 
         finally:
             self.is_running = False
-            self.current_playlist_id = None
-            self.current_playlist_title = None
+            self.active_playlists.clear()
 
     async def _sync_single_playlist(self, playlist_id: str):
         """Sync a single playlist by ID."""
@@ -73,9 +173,8 @@ class YouTubeSyncSimple:
                 logger.error(f"Playlist {playlist_id} not found")
                 return
 
-            self.current_playlist_id = playlist_id
-            self.current_playlist_title = playlist.title
-            self.progress_message = f"Syncing playlist: {playlist.title}"
+            self.active_playlists[playlist_id] = playlist.title
+            self._update_progress_message()
 
             logger.info(f"Syncing playlist: {playlist.title} ({playlist.url})")
 
@@ -147,11 +246,11 @@ class YouTubeSyncSimple:
                             media_type = MediaType.MOVIE
                             metadata = MovieMetadata(title=item.title)
 
-                        job = download_queue.add_job(
+                        job = download_queue.stage_job(
+                            session,
                             url=video_url,
                             media_type=media_type,
                             metadata=metadata,
-                            session=session,
                         )
                         item.download_id = job.id
                         item.download_status = YouTubeItemStatus.PENDING.value
@@ -207,11 +306,11 @@ class YouTubeSyncSimple:
                         )
 
                     # Add to download queue (pass session to avoid nested session lock)
-                    job = download_queue.add_job(
+                    job = download_queue.stage_job(
+                        session,
                         url=video_url,
                         media_type=media_type,
                         metadata=metadata,
-                        session=session,
                     )
 
                     # Update playlist item with download_id
@@ -231,9 +330,13 @@ class YouTubeSyncSimple:
                 session.rollback()
                 raise
 
+            finally:
+                self.active_playlists.pop(playlist_id, None)
+                self._update_progress_message()
+
 
 async def sync_playlist_items(playlist_id: str):
-    """Sync items for a specific playlist (called from background tasks)."""
+    """Sync items for a specific playlist (run by the sync worker)."""
     sync = YouTubeSyncSimple()
     sync.is_running = True
 
@@ -246,8 +349,6 @@ async def sync_playlist_items(playlist_id: str):
         raise
     finally:
         sync.is_running = False
-        sync.current_playlist_id = None
-        sync.current_playlist_title = None
 
 
 # Global instance for status tracking